@@ -0,0 +1,38 @@
+"""
+Hasar olay panosunun Streamlit'ten bağımsız yardımcı modülleri.
+
+Alt modüller tembel yüklenir: ``import hasar`` pandas/pyarrow/folium gibi ağır
+bağımlılıkları içe aktarmaz; ``hasar.read_table`` gibi bir ada ilk erişimde
+ilgili modül yüklenir.
+"""
+import importlib
+
+_EXPORTS = {
+    "read_table": "ingest",
+    "ensure_columns": "ingest",
+    "normalize_cols": "ingest",
+    "parse_dates": "ingest",
+    "type_frame": "ingest",
+    "IngestError": "ingest",
+    "infer_neighbors": "neighbors",
+    "Gazetteer": "gazetteer",
+    "GeocodeStore": "geocache",
+    "NominatimProvider": "geocache",
+    "StaticProvider": "geocache",
+    "EventStore": "eventstore",
+    "geocode_df": "pipeline",
+    "Pipeline": "pipeline",
+    "export_frame": "export",
+    "Aggregates": "aggregates",
+    "Profiler": "profiling",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
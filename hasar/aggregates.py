@@ -0,0 +1,133 @@
+"""
+Önceden hesaplanmış özet küpleri ve mekânsal kutular.
+
+Veri seti başına bir kez iki tablo kurulur:
+- ``cube``: İl/İlçe × il × sektör × olay türü × doğrulama × ay başına olay
+  sayısı (``count``) ve doğruluk ağırlıklı toplam (``weight`` = Σ doğruluk/100).
+- ``bins``: ``BIN_DEG`` derecelik ızgara hücresi × İl/İlçe × olay türü ×
+  doğrulama × ay başına aynı ölçüler.
+
+Tablo boyutu dolu boyut kombinasyonlarının sayısıdır ve satır sayısıyla birlikte
+büyür (sentetik veride 300 bin satırda ~170 bin küp grubu); kazanç, gruplamanın
+her kenar çubuğu değişikliğinde tekrarlanmamasıdır.
+
+Grafik ve ısı haritası panelleri ham satırlardan değil bu tablolardan, kenar
+çubuğu filtreleri uygulanarak toplanır. Tarih filtresi ay çözünürlüğündedir.
+Ölçüler toplanabilir olduğundan yeni satırlar ``updated`` ile mevcut özete
+eklenir; tüm veri yeniden gruplanmaz.
+"""
+import numpy as np
+import pandas as pd
+
+BIN_DEG = 0.05
+MEASURES = ["count", "weight"]
+CUBE_DIMS = ["IlIlce", "il", "sector", "event", "method", "month"]
+BIN_DIMS = ["cell", "IlIlce", "event", "method", "month"]
+_CELL_STRIDE = 1 << 20  # hücre id = satır * _CELL_STRIDE + sütun
+
+# Grafik gruplamaları: etiket -> küp boyutu
+GROUPINGS = {"İl": "il", "Sektör": "sector", "Olay Türü": "event", "Ay": "month"}
+
+
+def _row_keys(df, C):
+    month = df["_date"].dt.to_period("M").dt.to_timestamp()
+    return pd.DataFrame({
+        "IlIlce": df[C["IlIlce"]],
+        "il": df["_il"],
+        "sector": df[C["Sector"]],
+        "event": df[C["Event"]],
+        "method": df[C["Method"]],
+        "month": month,
+        "count": 1,
+        "weight": df["_conf"].fillna(0.0) / 100.0,
+    }, index=df.index)
+
+
+def _group(table, dims):
+    return table.groupby(dims, observed=True, dropna=False, sort=False)[MEASURES].sum().reset_index()
+
+
+def _merge(a, b, dims):
+    return _group(pd.concat([a, b], ignore_index=True), dims)
+
+
+def _cell_ids(lat, lon):
+    row = np.floor((lat + 90.0) / BIN_DEG).astype(np.int64)
+    col = np.floor((lon + 180.0) / BIN_DEG).astype(np.int64)
+    return row * _CELL_STRIDE + col
+
+
+def _cell_centers(cells):
+    row, col = np.divmod(np.asarray(cells, dtype=np.int64), _CELL_STRIDE)
+    return np.round((row + 0.5) * BIN_DEG - 90.0, 5), np.round((col + 0.5) * BIN_DEG - 180.0, 5)
+
+
+def _lut_mask(col, match):
+    """Kategorik kolonda ``match(kategori)`` doğru olan satırlar (kategori başına bir kez hesaplanır)."""
+    if not isinstance(col.dtype, pd.CategoricalDtype):
+        col = col.astype(str).astype("category")
+    lut = np.zeros(len(col.cat.categories) + 1, dtype=bool)  # son eleman: kod -1 (eksik)
+    lut[:-1] = [match(str(c)) for c in col.cat.categories]
+    return lut[col.cat.codes.to_numpy()]
+
+
+class Aggregates:
+    def __init__(self, cube, bins, rows):
+        self.cube = cube
+        self.bins = bins
+        self.rows = rows
+
+    @classmethod
+    def from_frame(cls, df, C):
+        keys = _row_keys(df, C)
+        cube = _group(keys, CUBE_DIMS)
+        geo = df["_lat"].notna() & df["_lon"].notna()
+        located = keys[geo.to_numpy()].assign(cell=_cell_ids(
+            df.loc[geo, "_lat"].to_numpy(dtype=float), df.loc[geo, "_lon"].to_numpy(dtype=float),
+        ))
+        bins = _group(located, BIN_DIMS)
+        return cls(cube, bins, len(df))
+
+    def updated(self, df_new, C):
+        """``df_new`` satırları eklenmiş yeni özet (maliyet: özet boyutu + yeni satırlar)."""
+        if not len(df_new):
+            return self
+        delta = Aggregates.from_frame(df_new, C)
+        return Aggregates(
+            _merge(self.cube, delta.cube, CUBE_DIMS),
+            _merge(self.bins, delta.bins, BIN_DIMS),
+            self.rows + delta.rows,
+        )
+
+    @staticmethod
+    def _filter(table, date_range=None, cities=None, events=None, methods=None):
+        keep = np.ones(len(table), dtype=bool)
+        if date_range is not None:
+            lo = pd.Timestamp(date_range[0]).to_period("M").to_timestamp()
+            hi = pd.Timestamp(date_range[1]).to_period("M").to_timestamp()
+            keep &= table["month"].between(lo, hi).to_numpy()
+        if cities:
+            cities = set(cities)
+            keep &= _lut_mask(table["IlIlce"], cities.__contains__)
+        if events:
+            events = set(events)
+            keep &= _lut_mask(table["event"], events.__contains__)
+        if methods:
+            keep &= _lut_mask(table["method"], lambda m: any(letter in m.upper() for letter in methods))
+        return table[keep]
+
+    def rollup(self, by, **filters):
+        """``by`` boyutuna göre toplanmış ``count``/``weight`` (filtreler ``QueryEngine.mask`` ile aynı)."""
+        t = self._filter(self.cube, **filters)
+        key = t[by] if by == "month" else t[by].astype(str)
+        out = t.groupby(key)[MEASURES].sum()
+        if by == "month":
+            return out.sort_index()
+        return out.sort_values("count", ascending=False)
+
+    def heat_points(self, **filters):
+        """Isı haritası için ``[[lat, lon, count], ...]`` (hücre merkezleri)."""
+        t = self._filter(self.bins, **filters)
+        cells = t.groupby("cell")["count"].sum()
+        lat, lon = _cell_centers(cells.index)
+        return [list(p) for p in zip(lat.tolist(), lon.tolist(), cells.tolist())]
@@ -0,0 +1,151 @@
+"""
+Aşama bazında ölçek testi.
+
+    python -m hasar bench --sizes 1000 10000 100000 -o bench.json
+
+Her boyut için ``synth.generate`` ile sentetik tablo üretilir, TSV baytlarına
+çevrilir ve hattın her aşaması ayrı ayrı, kendi girdisiyle zamanlanır (en iyi
+``repeat`` ölçüm). Geocode ağ yerine yerel bir sağlayıcıya (``StaticProvider``)
+ve geçici bir SQLite deposuna karşı çalışır. Sonuç, sürümler arası
+karşılaştırma için JSON olarak yazılır.
+"""
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+STAGES = (
+    "ingest", "parse_dates", "type_frame", "infer_neighbors", "geocode",
+    "query_index", "filter", "aggregates", "map", "export",
+)
+# Çıktısı sonraki aşamalarca zorunlu kullanılmayan (atlanabilir) aşamalar
+SKIPPABLE = ("infer_neighbors", "aggregates", "map", "export")
+
+
+def _timed(fn, repeat=1):
+    """``(en iyi süre, son sonuç)``."""
+    best, result = float("inf"), None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _filter_args(df, C):
+    """Tipik bir kenar çubuğu seçimi: orta tarih aralığı, İl/İlçe'lerin yarısı, tek doğrulama."""
+    dates = df["_date"].dropna()
+    lo, hi = dates.quantile(0.25), dates.quantile(0.75)
+    cities = sorted(df[C["IlIlce"]].cat.categories)
+    return (lo, hi), cities[::2], None, ["A"]
+
+
+def bench_size(n, seed=0, repeat=1, skip=()):
+    """
+    ``n`` satır için ölçüm kaydı (``stages``: ``{aşama: saniye}``, sıra ``STAGES``).
+    ``skip`` içindeki aşamalar ölçülmez ve ``None`` olarak raporlanır.
+    """
+    from .aggregates import Aggregates
+    from .export import export_csv_bytes
+    from .gazetteer import Gazetteer
+    from .geocache import GeocodeStore, StaticProvider
+    from .ingest import ensure_columns, normalize_cols, parse_dates, read_table, type_frame
+    from .maplayer import build_map, name_coords
+    from .neighbors import infer_neighbors
+    from .pipeline import geocode_df
+    from .query import QueryEngine
+    from .synth import generate
+
+    src = generate(n, seed=seed)
+    raw = src.to_csv(sep="\t", index=False).encode("utf-8")
+    gazetteer = Gazetteer.load()
+    C = normalize_cols(ensure_columns(src.head(0).copy()))
+    # Gazetteer'ın çözemediği adresler için yerel sağlayıcı
+    missing = src.loc[src[C["IlIlce"]].eq(""), C["Addr"]].unique()
+    provider = StaticProvider({a: (39.0, 35.0) for a in missing})
+
+    t = dict.fromkeys(STAGES)
+    t["ingest"], df = _timed(lambda: read_table(io.BytesIO(raw), name="synth.tsv"), repeat)
+    df = ensure_columns(df)
+    t["parse_dates"], _ = _timed(lambda: parse_dates(df[C["Tarih"]]), repeat)
+    # type_frame girdisini yerinde değiştirir; kopya süresi ölçüme dahildir
+    t["type_frame"], (df, _) = _timed(lambda: type_frame(df.copy(), C), repeat)
+    if "infer_neighbors" not in skip:
+        t["infer_neighbors"], df[C["Neighbors"]] = _timed(lambda: infer_neighbors(df, C), repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def geocode():
+            store = GeocodeStore(os.path.join(tmp, f"geo-{time.monotonic_ns()}.sqlite"))
+            try:
+                return geocode_df(df, C, gazetteer, store, provider)
+            finally:
+                store.close()
+        t["geocode"], df = _timed(geocode, repeat)
+
+    t["query_index"], engine = _timed(lambda: QueryEngine(df, C), repeat)
+    args = _filter_args(df, C)
+    t["filter"], _ = _timed(lambda: df[engine.mask(*args)], repeat)
+    if "aggregates" not in skip:
+        t["aggregates"], _ = _timed(lambda: Aggregates.from_frame(df, C), repeat)
+
+    q_geo = df.dropna(subset=["_lat", "_lon"])
+    def render_map():
+        m, _ = build_map(q_geo, C, name_coords(q_geo, C))
+        return m.get_root().render()
+    if "map" not in skip:
+        t["map"], _ = _timed(render_map, repeat)
+    if "export" not in skip:
+        t["export"], _ = _timed(lambda: export_csv_bytes(df, C), repeat)
+
+    return {
+        "rows": n,
+        "input_bytes": len(raw),
+        "located": int(df["_lat"].notna().sum()),
+        "stages": {k: None if v is None else round(v, 4) for k, v in t.items()},
+        "total": round(sum(v for v in t.values() if v is not None), 4),
+    }
+
+
+def run(sizes=DEFAULT_SIZES, seed=0, repeat=1, skip=(), log=print):
+    """Tüm boyutları çalıştır; JSON'a yazılabilir sonuç sözlüğü döndür."""
+    import folium
+    import pandas as pd
+
+    results = []
+    for n in sizes:
+        r = bench_size(n, seed=seed, repeat=repeat, skip=skip)
+        log(f"{n:>9} satır  " + "  ".join(f"{k}={v:.3f}" for k, v in r["stages"].items() if v is not None))
+        results.append(r)
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "folium": folium.__version__,
+        "seed": seed,
+        "repeat": repeat,
+        "skipped": sorted(skip),
+        "results": results,
+    }
+
+
+def write(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
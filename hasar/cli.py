@@ -0,0 +1,168 @@
+"""
+Komut satırı araçları (Streamlit gerektirmez).
+
+    python -m hasar enrich gelenler/*.tsv -o cikti/ -j 8
+    python -m hasar bench --sizes 1000 100000 -o bench.json
+    python -m hasar synth 50000 -o ornek.tsv
+
+``enrich``: her dosya bir süreç havuzunda bağımsız işlenir (oku -> tiple ->
+komşular -> geocode -> dışa aktar). Tüm süreçler aynı SQLite geocode deposunu
+paylaşır; ağ sağlayıcısına giden istekler süreçler arası ortak bir kilitle hız
+sınırlanır. Ağır modüller (pandas, pyarrow, geopy) yalnızca işçilerde ve
+gerektiğinde yüklenir.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# İşçi süreç durumu (initializer ile kurulur)
+_worker = {}
+
+
+class _SharedRateGate:
+    """Sağlayıcı çağrılarını tüm süreçlerde ``min_delay`` saniyede bire indirger."""
+
+    def __init__(self, provider, lock, last_call, min_delay):
+        self.provider = provider
+        self.lock = lock
+        self.last_call = last_call
+        self.min_delay = min_delay
+
+    def __call__(self, addr):
+        with self.lock:
+            wait = self.last_call.value + self.min_delay - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            self.last_call.value = time.time()
+        return self.provider(addr)
+
+
+def _init_worker(db_path, offline, lock, last_call, min_delay):
+    from .gazetteer import Gazetteer
+    from .geocache import GeocodeStore, NominatimProvider
+    from .pipeline import Pipeline
+
+    provider = None
+    if not offline:
+        # Süreç içi RateLimiter kapalı; sınır ortak kapıdan gelir
+        provider = _SharedRateGate(NominatimProvider(min_delay_seconds=0), lock, last_call, min_delay)
+    store = GeocodeStore(db_path)
+    _worker["pipeline"] = Pipeline(Gazetteer.load(), store, provider, max_entries=1)
+
+
+def output_path(src, out_dir, fmt):
+    return Path(out_dir) / f"{Path(src).stem}.enriched.{fmt}"
+
+
+def enrich_file(src, out_dir, fmt="csv", radius_km=0.0):
+    """Tek dosyayı işle; özet sözlüğü döndür (işçi süreçte çalışır)."""
+    from .export import export_frame
+
+    t0 = time.perf_counter()
+    # Yoldan okunur: Parquet/Arrow bellek eşlemeli, dosya baytları kopyalanmaz
+    ds = _worker["pipeline"].run_path(src)
+    df = ds.with_proximity(radius_km)
+    out = export_frame(df, ds.C)
+    dest = output_path(src, out_dir, fmt)
+    if fmt == "parquet":
+        out.to_parquet(dest, index=False)
+    else:
+        out.to_csv(dest, index=False)
+    return {
+        "file": str(src),
+        "output": str(dest),
+        "rows": len(df),
+        "located": int(df["_lat"].notna().sum()),
+        "unparsed": {k: len(v) for k, v in ds.report.items()},
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def _run_enrich(args):
+    import multiprocessing as mp
+
+    from .geocache import DEFAULT_DB_PATH
+
+    os.makedirs(args.output, exist_ok=True)
+    ctx = mp.get_context("spawn")
+    lock, last_call = ctx.Lock(), ctx.Value("d", 0.0)
+    initargs = (args.geocode_db or DEFAULT_DB_PATH, args.offline, lock, last_call, args.min_delay)
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.jobs, mp_context=ctx,
+                             initializer=_init_worker, initargs=initargs) as pool:
+        futures = {pool.submit(enrich_file, f, args.output, args.format, args.radius): f for f in args.inputs}
+        for fut in as_completed(futures):
+            src = futures[fut]
+            try:
+                r = fut.result()
+            except Exception as e:
+                failed += 1
+                print(f"HATA  {src}: {e}", file=sys.stderr)
+                continue
+            print(f"OK    {r['file']} -> {r['output']}  {r['rows']} satır, "
+                  f"{r['located']} konumlu, {r['seconds']} sn")
+    return 1 if failed else 0
+
+
+def _run_bench(args):
+    from . import bench
+
+    report = bench.run(args.sizes or bench.DEFAULT_SIZES, seed=args.seed, repeat=args.repeat, skip=args.skip)
+    bench.write(report, args.output)
+    print(f"Sonuçlar: {args.output}")
+    return 0
+
+
+def _run_synth(args):
+    from .synth import generate
+
+    df = generate(args.rows, seed=args.seed)
+    sep = "," if args.output.endswith(".csv") else "\t"
+    df.to_csv(args.output, sep=sep, index=False)
+    print(f"{len(df)} satır -> {args.output}")
+    return 0
+
+
+def build_parser():
+    from .bench import SKIPPABLE
+
+    parser = argparse.ArgumentParser(prog="python -m hasar", description="Hasar olay verisi araçları")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("enrich", help="CSV/TSV/Parquet/Arrow dosyalarını topluca zenginleştir")
+    p.add_argument("inputs", nargs="+", help="Girdi dosyaları")
+    p.add_argument("-o", "--output", default="enriched", help="Çıktı klasörü (varsayılan: enriched)")
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Paralel süreç sayısı")
+    p.add_argument("-f", "--format", choices=("csv", "parquet"), default="csv", help="Çıktı biçimi")
+    p.add_argument("--geocode-db", help="Ortak geocode deposu (varsayılan: HASAR_GEOCODE_DB veya proje kökü)")
+    p.add_argument("--offline", action="store_true", help="Ağ sağlayıcısını kullanma (yalnızca gazetteer + depo)")
+    p.add_argument("--min-delay", type=float, default=1.0, help="Sağlayıcı istekleri arası en az süre (sn)")
+    p.add_argument("--radius", type=float, default=0.0,
+                   help="Yarıçap içindeki tesisleri 'Yakın Tesisler' kolonuna yaz (km, 0 = kapalı)")
+    p.set_defaults(func=_run_enrich)
+
+    p = sub.add_parser("bench", help="Sentetik veriyle aşama bazında ölçek testi (JSON çıktı)")
+    p.add_argument("--sizes", type=int, nargs="+", help="Satır sayıları (varsayılan: 1000 10000 100000)")
+    p.add_argument("-o", "--output", default="bench.json", help="Sonuç dosyası (varsayılan: bench.json)")
+    p.add_argument("--repeat", type=int, default=1, help="Aşama başına tekrar (en iyisi alınır)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--skip", nargs="+", default=[], metavar="AŞAMA",
+                   choices=SKIPPABLE,
+                   help="Ölçülmeyecek aşamalar (ör. büyük boyutlarda map)")
+    p.set_defaults(func=_run_bench)
+
+    p = sub.add_parser("synth", help="Sentetik olay dosyası üret (TSV; .csv uzantısıyla CSV)")
+    p.add_argument("rows", type=int, help="Satır sayısı")
+    p.add_argument("-o", "--output", default="synth.tsv", help="Çıktı dosyası (varsayılan: synth.tsv)")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=_run_synth)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
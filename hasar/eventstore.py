@@ -0,0 +1,223 @@
+"""
+Kalıcı, yalnızca eklemeli (append-only) olay deposu.
+
+Yüklenen dosyalar depoya artımlı olarak birleştirilir:
+- Her satırın içerik özeti (fingerprint) tekildir; aynı satır ikinci kez
+  eklenmez, aynı dosyayı tekrar yüklemek zararsızdır.
+- Mükerrer olay tespiti bloklama ile yapılır: aday karşılaştırmalar yalnızca
+  aynı ilde, tarih penceresi içinde ve normalize tesis adında en az bir ortak
+  ayırt edici token taşıyan olaylarla yapılır (``blocks`` tablosu indeksli).
+  ``MAX_BLOCK``'tan kalabalık bloklar (ör. "tekstil", "metal") ayırt edici
+  sayılmaz ve atlanır; satır başına iş sınırlı kalır, birleştirme doğrusala
+  yakın ölçeklenir.
+  Aday skoru ad token'larının örtüşme katsayısıdır; eşiği geçen yeni olay,
+  eşleştiği olayın kanonik kaydına ``duplicate_of`` ile bağlanır. Mevcut
+  kayıtlar hiçbir zaman değiştirilmez.
+
+Pano, dosyaları yeniden ayrıştırmak yerine ``load_frame`` ile depodan okur.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from .gazetteer import split_il_ilce
+from .ingest import normalize_cols, parse_dates
+from .textutil import normalize_text
+
+DEFAULT_DB_PATH = os.environ.get(
+    "HASAR_EVENT_DB", str(Path(__file__).resolve().parent.parent / "events.sqlite")
+)
+DATE_WINDOW_DAYS = 2
+MATCH_THRESHOLD = 0.5
+MAX_BLOCK = 50
+
+# Tesis adlarında ayırt edici olmayan (hukuki/genel) kelimeler
+NAME_STOPWORDS = frozenset(
+    "a ş as aş ve ltd şti sti san tic sanayi ticaret sanayii limited şirketi anonim "
+    "ithalat ihracat iç dış pazarlama tesis tesisi fabrikası fabrika depo deposu".split()
+)
+
+
+def name_tokens(name):
+    """Parantez içi açıklamalar dahil, ayırt edici ad token'ları (tek harfler hariç)."""
+    return {t for t in normalize_text(name).split() if len(t) > 1 and t not in NAME_STOPWORDS}
+
+
+def match_score(a, b):
+    """
+    Örtüşme katsayısı |A ∩ B| / min(|A|, |B|); kısa adın alternatif ad olarak
+    uzun adın içinde geçmesini yakalar. Tek ortak kelime (ör. "mobilya") yalnızca
+    adlardan biri tek kelimeyse yeterlidir.
+    """
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    if shared < min(2, len(a), len(b)):
+        return 0.0
+    return shared / min(len(a), len(b))
+
+
+def row_fingerprint(record):
+    payload = json.dumps({k: str(v).strip() for k, v in record.items()}, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EventStore:
+    def __init__(self, path=DEFAULT_DB_PATH, date_window_days=DATE_WINDOW_DAYS, threshold=MATCH_THRESHOLD):
+        self.path = str(path)
+        self.date_window = timedelta(days=date_window_days)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY,
+                    fingerprint TEXT NOT NULL UNIQUE,
+                    il TEXT NOT NULL,
+                    event_date TEXT,
+                    name TEXT NOT NULL,
+                    duplicate_of INTEGER REFERENCES events(id),
+                    score REAL,
+                    source TEXT,
+                    imported_at REAL NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS events_il_date ON events (il, event_date);
+                CREATE TABLE IF NOT EXISTS blocks (
+                    il TEXT NOT NULL,
+                    token TEXT NOT NULL,
+                    event_date TEXT NOT NULL,
+                    event_id INTEGER NOT NULL REFERENCES events(id)
+                );
+                CREATE INDEX IF NOT EXISTS blocks_key ON blocks (il, token, event_date);
+                """
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def version(self):
+        """Depo içeriği değiştiğinde değişen anahtar (yalnızca ekleme yapıldığı için son id yeterli)."""
+        with self._lock:
+            n, last = self._conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM events").fetchone()
+        return f"{self.path}:{n}:{last}"
+
+    def _candidates(self, il, day, tokens):
+        """Bloklardan aday olay id'leri (kalabalık bloklar atlanır)."""
+        lo = (day - self.date_window).isoformat()
+        hi = (day + self.date_window).isoformat()
+        ids = set()
+        for token in tokens:
+            rows = self._conn.execute(
+                "SELECT event_id FROM blocks WHERE il = ? AND token = ? AND event_date BETWEEN ? AND ? LIMIT ?",
+                (il, token, lo, hi, MAX_BLOCK + 1),
+            ).fetchall()
+            if len(rows) <= MAX_BLOCK:
+                ids.update(r[0] for r in rows)
+        return ids
+
+    def merge(self, df, source=""):
+        """
+        ``df`` satırlarını depoya ekle. ``{"inserted", "existing", "duplicates"}``
+        sayılarını döndürür.
+        """
+        C = normalize_cols(df)
+        dates = parse_dates(df[C["Tarih"]]) if C["Tarih"] in df.columns else pd.Series(pd.NaT, index=df.index)
+        records = df.astype(str).to_dict(orient="records")
+        stats = {"inserted": 0, "existing": 0, "duplicates": 0}
+        now = time.time()
+        known = {}  # olay id -> (ad token'ları, kanonik id) (bu birleştirme boyunca)
+        with self._lock, self._conn:
+            for rec, ts in zip(records, dates):
+                fp = row_fingerprint(rec)
+                if self._conn.execute("SELECT 1 FROM events WHERE fingerprint = ?", (fp,)).fetchone():
+                    stats["existing"] += 1
+                    continue
+                name = rec.get(C["Name"], "")
+                il = split_il_ilce(rec.get(C["IlIlce"], ""))[0]
+                day = ts.date() if pd.notna(ts) else None
+                tokens = sorted(name_tokens(name))
+
+                dup_of, best = None, 0.0
+                if day is not None:
+                    for cand in self._candidates(il, day, tokens):
+                        if cand not in known:
+                            other, canonical = self._conn.execute(
+                                "SELECT name, COALESCE(duplicate_of, id) FROM events WHERE id = ?", (cand,)
+                            ).fetchone()
+                            known[cand] = (name_tokens(other), canonical)
+                        other_tokens, canonical = known[cand]
+                        score = match_score(set(tokens), other_tokens)
+                        if score >= self.threshold and score > best:
+                            dup_of, best = canonical, score
+
+                cur = self._conn.execute(
+                    "INSERT INTO events (fingerprint, il, event_date, name, duplicate_of, score, source, imported_at, data)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (fp, il, day.isoformat() if day else None, name, dup_of, best if dup_of else None,
+                     source, now, json.dumps(rec, ensure_ascii=False)),
+                )
+                if day is not None:
+                    known[cur.lastrowid] = (set(tokens), dup_of or cur.lastrowid)
+                    self._conn.executemany(
+                        "INSERT INTO blocks (il, token, event_date, event_id) VALUES (?, ?, ?, ?)",
+                        [(il, t, day.isoformat(), cur.lastrowid) for t in tokens],
+                    )
+                stats["inserted"] += 1
+                if dup_of is not None:
+                    stats["duplicates"] += 1
+        return stats
+
+    def load_frame(self, include_duplicates=False, since=None, until=None, il=None):
+        """
+        Depodaki olayları orijinal kolonlarıyla döndür (``_event_id``,
+        ``_duplicate_of`` ekli). Filtreler indeksli kolonlar üzerinden çalışır.
+        """
+        where, params = [], []
+        if not include_duplicates:
+            where.append("duplicate_of IS NULL")
+        if il:
+            where.append("il = ?")
+            params.append(split_il_ilce(il)[0])
+        if since:
+            where.append("event_date >= ?")
+            params.append(pd.Timestamp(since).date().isoformat())
+        if until:
+            where.append("event_date <= ?")
+            params.append(pd.Timestamp(until).date().isoformat())
+        sql = "SELECT id, duplicate_of, data FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        df = pd.DataFrame([json.loads(d) for _, _, d in rows]).fillna("")
+        df["_event_id"] = [r[0] for r in rows]
+        df["_duplicate_of"] = pd.array([r[1] for r in rows], dtype="Int64")
+        return df
+
+    def duplicate_groups(self):
+        """``{kanonik id: [mükerrer id'ler]}``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT duplicate_of, id FROM events WHERE duplicate_of IS NOT NULL ORDER BY id"
+            ).fetchall()
+        groups = {}
+        for canonical, eid in rows:
+            groups.setdefault(canonical, []).append(eid)
+        return groups
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,17 @@
+"""
+İndirilebilir/dışa aktarılan tablo biçimi (pano ve komut satırı aynı kolonları yazar).
+"""
+EXPORT_KEYS = (
+    "Tarih", "IlIlce", "Addr", "Name", "Sector", "Event",
+    "Method", "Conf", "Sources", "Cause", "PD", "BI",
+    "Quote", "URLs", "Neighbors", "Nearby",
+)
+
+
+def export_frame(df, C):
+    cols = [C[k] for k in EXPORT_KEYS] + ["_lat", "_lon"]
+    return df[cols].rename(columns={"_lat": "Lat", "_lon": "Lon"})
+
+
+def export_csv_bytes(df, C):
+    return export_frame(df, C).to_csv(index=False).encode("utf-8")
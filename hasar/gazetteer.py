@@ -0,0 +1,128 @@
+"""
+Çevrimdışı gazetteer: OSB'ler, sanayi siteleri, ilçeler ve il merkezleri.
+
+Veri ``data/gazetteer.tsv`` dosyasından yüklenir. Site adları (ve takma adları)
+Türkçe katlanmış token dizileri olarak bir token trie'sine yerleştirilir; adres
+metni tek geçişte taranır. Site bulunamazsa İl/İlçe kolonundan ilçe, o da yoksa
+il merkezine düşülür. Sonuç hangi düzeyde eşleştiğini de taşır.
+
+İlçe tablosu tüm ilçeleri kapsamaz; ``geocode_df`` bu yüzden il düzeyindeki
+eşleşmeyi yalnızca depo/sağlayıcı bulamazsa kullanır.
+"""
+import csv
+import re
+from pathlib import Path
+
+from .textutil import normalize_text
+
+DEFAULT_PATH = Path(__file__).with_name("data") / "gazetteer.tsv"
+
+# Düzeyler, kesinlik sırasına göre
+SITE_LEVELS = ("osb", "sanayi")
+CENTROID_LEVELS = ("ilce", "il")
+LEVELS = SITE_LEVELS + CENTROID_LEVELS
+
+_END = "$"
+
+# Adresin bir OSB/sanayi sitesinde olduğunu gösteren ifadeler (normalize metin üzerinde)
+_SITE_HINT = re.compile(
+    r"\b(?:osb|organize sanayi|org san|sanayi sitesi|san sit|sanayi bölgesi)\b"
+)
+
+
+def split_il_ilce(s):
+    """'Bursa/Nilüfer' -> ('bursa', 'nilüfer'); eksik kısımlar ''."""
+    parts = [normalize_text(p) for p in str(s).split("/", 1)]
+    il = parts[0] if parts else ""
+    ilce = parts[1] if len(parts) > 1 else ""
+    return il, ilce
+
+
+def mentions_site(addr):
+    """Adres bir OSB/sanayi sitesi adı taşıyor mu (trie'de olmasa da)."""
+    return _SITE_HINT.search(normalize_text(addr)) is not None
+
+
+class Gazetteer:
+    def __init__(self, entries):
+        """
+        ``entries``: ``level, name, aliases, il, ilce, lat, lon`` anahtarlı sözlükler.
+        ``aliases`` '|' ile ayrılmış ek adlardır.
+        """
+        self.entries = []
+        self._trie = {}
+        self._ilce = {}
+        self._il = {}
+        for e in entries:
+            level = e["level"].strip()
+            if level not in LEVELS:
+                raise ValueError(f"Bilinmeyen gazetteer düzeyi: {level!r}")
+            entry = {
+                "level": level,
+                "name": e["name"].strip(),
+                "il": normalize_text(e.get("il", "")),
+                "ilce": normalize_text(e.get("ilce", "")),
+                "lat": float(e["lat"]),
+                "lon": float(e["lon"]),
+            }
+            idx = len(self.entries)
+            self.entries.append(entry)
+            if level == "il":
+                self._il[entry["il"] or normalize_text(entry["name"])] = idx
+            elif level == "ilce":
+                self._ilce[(entry["il"], entry["ilce"] or normalize_text(entry["name"]))] = idx
+            else:
+                names = [entry["name"]] + [a for a in str(e.get("aliases", "")).split("|") if a.strip()]
+                for nm in names:
+                    self._insert(normalize_text(nm).split(), idx)
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with open(path, encoding="utf-8", newline="") as fh:
+            return cls(list(csv.DictReader(fh, delimiter="\t")))
+
+    def _insert(self, tokens, idx):
+        if not tokens:
+            return
+        node = self._trie
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+        node.setdefault(_END, []).append((idx, len(tokens)))
+
+    def match_site(self, addr, il=""):
+        """
+        Adres metnindeki en uzun site eşleşmesini döndür (entry sözlüğü veya None).
+        ``il`` verilmişse başka ildeki siteler elenir.
+        """
+        tokens = normalize_text(addr).split()
+        best, best_len = None, 0
+        for start in range(len(tokens)):
+            node = self._trie
+            for tok in tokens[start:]:
+                node = node.get(tok)
+                if node is None:
+                    break
+                for idx, n in node.get(_END, ()):
+                    entry = self.entries[idx]
+                    if il and entry["il"] and entry["il"] != il:
+                        continue
+                    if n > best_len:
+                        best, best_len = entry, n
+        return best
+
+    def lookup(self, addr, il_ilce=""):
+        """
+        Hiyerarşik çözümleme: site (OSB/sanayi) -> ilçe -> il merkezi.
+        ``(lat, lon, level)`` veya hiçbir düzeyde eşleşme yoksa ``None`` döndürür.
+        """
+        il, ilce = split_il_ilce(il_ilce)
+        site = self.match_site(addr, il)
+        if site is not None:
+            return site["lat"], site["lon"], site["level"]
+        idx = self._ilce.get((il, ilce))
+        if idx is None:
+            idx = self._il.get(il)
+        if idx is None:
+            return None
+        entry = self.entries[idx]
+        return entry["lat"], entry["lon"], entry["level"]
@@ -0,0 +1,199 @@
+"""
+Kalıcı geocode deposu ve toplu geocode ön yüzü.
+
+- Sonuçlar normalize edilmiş adres anahtarıyla bir SQLite dosyasında tutulur;
+  süreç yeniden başlasa da (redeploy) kaybolmaz.
+- Bulunamayan adresler de negatif kayıt olarak (daha kısa TTL ile) saklanır.
+- ``geocode_addresses`` tüm adresleri önce tekilleştirir; her benzersiz adres
+  en fazla bir kez çözülür. Sağlayıcı sonuçları parça parça depoya yazılır;
+  uzun bir çalıştırma yarıda kesilse de çözülenler korunur.
+- Sağlayıcı (provider) takılabilir: ``adres -> (lat, lon) | None`` döndüren her
+  çağrılabilir nesne kullanılabilir (testlerde ``StaticProvider`` gibi).
+"""
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .textutil import normalize_text
+
+# Pano ve komut satırı aynı depoyu paylaşır
+DEFAULT_DB_PATH = os.environ.get(
+    "HASAR_GEOCODE_DB", str(Path(__file__).resolve().parent.parent / "geocode_cache.sqlite")
+)
+
+DAY = 24 * 3600
+DEFAULT_TTL = 180 * DAY
+NEGATIVE_TTL = 7 * DAY
+# Sağlayıcı sonuçları bu kadar birikince depoya yazılır (uzun çalıştırmada kesinti olursa kayıp sınırlı kalır)
+FLUSH_EVERY = 50
+
+
+def normalize_address(addr):
+    """Depo anahtarı: Türkçe katlanmış, noktalamasız, tek boşluklu adres."""
+    return normalize_text(addr)
+
+
+class GeocodeStore:
+    """
+    SQLite tabanlı geocode deposu.
+
+    Her kayıt ``(key, lat, lon, expires)`` şeklindedir; ``lat``/``lon`` NULL ise
+    kayıt negatiftir (adres bulunamadı). Süresi dolan kayıtlar yok sayılır ve
+    bir sonraki yazmada üzerine yazılır.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL, negative_ttl=NEGATIVE_TTL):
+        self.path = str(path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                " key TEXT PRIMARY KEY,"
+                " lat REAL,"
+                " lon REAL,"
+                " expires REAL NOT NULL)"
+            )
+
+    def get_many(self, keys):
+        """
+        Geçerli kayıtları döndür: ``{key: (lat, lon)}``, negatifler için ``{key: None}``.
+        Depoda olmayan veya süresi dolmuş anahtarlar sonuçta yer almaz.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        with self._lock:
+            # SQLite parametre sınırına takılmamak için parça parça sorgula
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, lat, lon FROM geocode WHERE expires > ? AND key IN ({marks})",
+                    [now, *part],
+                )
+                for key, lat, lon in rows:
+                    found[key] = None if lat is None or lon is None else (lat, lon)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, results):
+        """``{key: (lat, lon) | None}`` sonuçlarını yaz (None = negatif kayıt)."""
+        now = time.time()
+        rows = []
+        for key, xy in results.items():
+            if xy is None:
+                rows.append((key, None, None, now + self.negative_ttl))
+            else:
+                rows.append((key, float(xy[0]), float(xy[1]), now + self.ttl))
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO geocode (key, lat, lon, expires) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def purge_expired(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM geocode WHERE expires <= ?", (time.time(),))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class NominatimProvider:
+    """
+    Nominatim sağlayıcısı. İstemci ve RateLimiter bir kez kurulur; tüm çağrılar
+    aynı hız sınırını paylaşır. Ağ hataları yutulmaz, çağırana iletilir ki geçici
+    hatalar negatif sonuç olarak depoya yazılmasın.
+    """
+
+    def __init__(self, user_agent="hasar-istihbarat/1.0", min_delay_seconds=1, suffix=", Türkiye"):
+        from geopy.geocoders import Nominatim
+        from geopy.extra.rate_limiter import RateLimiter
+
+        self.suffix = suffix
+        geolocator = Nominatim(user_agent=user_agent)
+        self._geocode = RateLimiter(
+            geolocator.geocode, min_delay_seconds=min_delay_seconds,
+            max_retries=2, swallow_exceptions=False,
+        )
+
+    def __call__(self, addr):
+        loc = self._geocode(addr + self.suffix)
+        if loc:
+            return loc.latitude, loc.longitude
+        return None
+
+
+class StaticProvider:
+    """Sözlükten çözen yerel sağlayıcı (test ve çevrimdışı kullanım için)."""
+
+    def __init__(self, mapping=None):
+        self.mapping = {normalize_address(k): v for k, v in (mapping or {}).items()}
+        self.calls = 0
+
+    def __call__(self, addr):
+        self.calls += 1
+        return self.mapping.get(normalize_address(addr))
+
+
+def geocode_addresses(addresses, store=None, provider=None, flush_every=FLUSH_EVERY):
+    """
+    Adres listesini topluca çöz; ``{adres: (lat, lon)}`` döndürür, çözülemeyenler
+    ``(None, None)`` olur.
+
+    Sıra: ``store`` -> ``provider``. Aynı normalize anahtara düşen adresler tek
+    sorguyla çözülür. Sağlayıcı sonuçları ``flush_every`` kayıtta bir depoya yazılır.
+    """
+    by_key = {}
+    for addr in dict.fromkeys(str(a) for a in addresses):
+        by_key.setdefault(normalize_address(addr), []).append(addr)
+
+    resolved = {}
+    pending = []
+    for key in by_key:
+        if key:
+            pending.append(key)
+        else:
+            resolved[key] = None
+
+    if store is not None and pending:
+        cached = store.get_many(pending)
+        resolved.update(cached)
+        pending = [k for k in pending if k not in cached]
+
+    if provider is not None and pending:
+        batch = {}
+        try:
+            for key in pending:
+                try:
+                    xy = provider(by_key[key][0])
+                except Exception:
+                    # Geçici hata: depoya yazma, bir sonraki çalıştırmada tekrar denenir
+                    continue
+                resolved[key] = batch[key] = xy
+                if store is not None and len(batch) >= flush_every:
+                    store.put_many(batch)
+                    batch = {}
+        finally:
+            # Kesintide (ör. redeploy) o ana kadar çözülenler kaybolmaz
+            if store is not None:
+                store.put_many(batch)
+
+    out = {}
+    for key, originals in by_key.items():
+        xy = resolved.get(key) or (None, None)
+        for addr in originals:
+            out[addr] = xy
+    return out
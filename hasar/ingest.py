@@ -0,0 +1,292 @@
+"""
+Veri alımı: dosya okuma ve tipleme.
+
+Okuma (``read_table``): CSV/TSV akış halinde, parça parça okunur; kodlama ve
+ayraç dosyanın başından koklanır, başlık ``normalize_cols`` ile doğrulanır.
+Parquet ve Arrow IPC dosyaları doğrudan (yoldan okunurken bellek eşlemeli)
+yüklenir.
+
+Ham tablo (tüm kolonlar ``fillna("")`` edilmiş metin) burada bir kez tiplenir:
+- Tarih: format kademesiyle vektörel olarak ``datetime64`` (``_date``)
+- İl/İlçe, Olay Türü, Sektör/Tip, Doğrulama: ``category``
+- İl/İlçe ayrıca ``_il`` / ``_ilce`` kolonlarına bölünür
+- Doğruluk Oranı: sayısal yüzde (``_conf``, 0–100)
+
+Çözülemeyen değerler kolon bazında bir raporda döndürülür.
+"""
+import codecs
+import csv
+import io
+import os
+
+import pandas as pd
+
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y")
+CATEGORICAL_KEYS = ("IlIlce", "Event", "Sector", "Method")
+# typed_columns'un okuduğu kolonlar (satır önbelleği anahtarı)
+TYPED_INPUT_KEYS = ("Tarih", "Conf", "IlIlce")
+
+
+# Başlıkta bulunması zorunlu alanlar (normalize_cols anahtarları)
+REQUIRED_KEYS = ("Tarih", "IlIlce", "Addr", "Name", "Event")
+# Denenecek kodlamalar: UTF-8 (BOM'lu/BOM'suz), Windows Türkçe, ISO Türkçe
+ENCODINGS = ("utf-8-sig", "cp1254", "iso-8859-9")
+DELIMITERS = "\t,;|"
+SNIFF_BYTES = 64 * 1024
+CHUNK_ROWS = 50_000
+PARQUET_MAGIC = b"PAR1"
+ARROW_MAGIC = b"ARROW1"
+ARROW_EXTS = (".arrow", ".feather", ".ipc", ".arrows")
+
+
+class IngestError(ValueError):
+    """Dosya okunamadı veya başlık beklenen şemaya uymuyor."""
+
+
+def ensure_columns(df):
+    """Eksik isteğe bağlı kolonları boş olarak ekle (başlık eşleşmesi büyük/küçük harfe duyarsız)."""
+    needed = [
+        "Sektör/Tip", "Doğrulama Yöntemi (A/B)", "Doğruluk Oranı", "Çıkış Şekli", "PD Etkisi", "BI Etkisi", "Alıntı",
+        "Kaynak URL’leri", "Çevre Tesisler", "Yakın Tesisler", "Lat", "Lon"
+    ]
+    present = {str(c).lower().strip() for c in df.columns}
+    for c in needed:
+        if c.lower() not in present:
+            df[c] = ""
+    return df
+
+
+def normalize_cols(df):
+    def col(name):
+        for c in df.columns:
+            if c.lower().strip() == name.lower().strip():
+                return c
+        return name
+    return {
+        "Tarih": col("Tarih"),
+        "IlIlce": col("İl/İlçe"),
+        "Addr": col("OSB/Mevki (Parsel/Adres)"),
+        "Name": col("Tesis Adı (Alternatifler)"),
+        "Sector": col("Sektör/Tip"),
+        "Event": col("Olay Türü"),
+        "Method": col("Doğrulama Yöntemi (A/B)"),
+        "Conf": col("Doğruluk Oranı"),
+        "Sources": col("Kaynaklar"),
+        "Cause": col("Çıkış Şekli"),
+        "PD": col("PD Etkisi"),
+        "BI": col("BI Etkisi"),
+        "Quote": col("Alıntı"),
+        "URLs": col("Kaynak URL’leri"),
+        "Neighbors": col("Çevre Tesisler"),
+        "Nearby": col("Yakın Tesisler"),
+        "Lat": "Lat",
+        "Lon": "Lon",
+    }
+
+
+def parse_dates(s):
+    """Her formatı yalnızca önceki formatlarla çözülemeyen satırlara uygula."""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s.dt.tz_localize(None) if s.dt.tz is not None else s
+    s = s.astype(str).str.strip()
+    out = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    todo = s.ne("")
+    for fmt in DATE_FORMATS:
+        if not todo.any():
+            break
+        out[todo] = pd.to_datetime(s[todo], format=fmt, errors="coerce")
+        todo = todo & out.isna()
+    return out
+
+
+def parse_confidence(s):
+    """
+    '95%' -> 95.0, '0,9' -> 90.0, '1' -> 100.0. Yüzde işareti olmayan ve 1'den
+    küçük/eşit değerler oran kabul edilir.
+    """
+    s = s.astype(str).str.strip()
+    has_pct = s.str.endswith("%")
+    num = pd.to_numeric(s.str.rstrip("%").str.strip().str.replace(",", ".", regex=False), errors="coerce")
+    num = num.where(has_pct | (num > 1), num * 100)
+    return num.astype("float64")
+
+
+def _unparsed(raw, parsed):
+    bad = raw.astype(str).str.strip()
+    bad = bad[bad.ne("") & parsed.isna()]
+    return sorted(bad.unique().tolist())
+
+
+def typed_columns(df, C):
+    """
+    Satır bazında türetilen kolonlar: ``_date``, ``_conf``, ``_il``, ``_ilce``
+    (henüz kategorik değil). Yalnızca ``TYPED_INPUT_KEYS`` kolonlarını okur.
+    """
+    parts = df[C["IlIlce"]].astype(str).str.split("/", n=1, expand=True).reindex(columns=[0, 1])
+    return pd.DataFrame({
+        "_date": parse_dates(df[C["Tarih"]]),
+        "_conf": parse_confidence(df[C["Conf"]]),
+        "_il": parts[0].fillna("").str.strip(),
+        "_ilce": parts[1].fillna("").str.strip(),
+    }, index=df.index)
+
+
+def type_frame(df, C, typed=None):
+    """
+    ``df``'yi yerinde tiple; ``(df, report)`` döndürür. ``report``:
+    ``{kolon adı: [çözülemeyen benzersiz değerler]}`` (yalnızca sorunlu kolonlar).
+    ``typed`` (``typed_columns`` çıktısı, ör. satır önbelleğinden) verilirse
+    satır bazında yeniden hesaplanmaz.
+    """
+    if typed is None:
+        typed = typed_columns(df, C)
+    report = {}
+
+    df["_date"] = typed["_date"]
+    bad = _unparsed(df[C["Tarih"]], df["_date"])
+    if bad:
+        report[C["Tarih"]] = bad
+
+    df["_conf"] = typed["_conf"]
+    bad = _unparsed(df[C["Conf"]], df["_conf"])
+    if bad:
+        report[C["Conf"]] = bad
+
+    df["_il"] = typed["_il"].astype("category")
+    df["_ilce"] = typed["_ilce"].astype("category")
+
+    for key in CATEGORICAL_KEYS:
+        df[C[key]] = df[C[key]].astype(str).astype("category")
+    return df, report
+
+
+def validate_header(columns):
+    """Zorunlu alanlar eksikse ``IngestError`` yükselt; aksi halde ``C`` sözlüğünü döndür."""
+    C = normalize_cols(pd.DataFrame(columns=list(columns)))
+    missing = [C[k] for k in REQUIRED_KEYS if C[k] not in columns]
+    if missing:
+        raise IngestError(
+            "Başlıkta zorunlu kolon(lar) eksik: " + ", ".join(missing)
+            + ". Bulunan: " + ", ".join(map(str, columns))
+        )
+    return C
+
+
+def sniff_encoding(sample):
+    """Örnek baytları hatasız çözen ilk kodlama (sondaki yarım karakter tolere edilir)."""
+    for enc in ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    raise IngestError("Dosya kodlaması tanınamadı (UTF-8 / Windows-1254 / ISO-8859-9 denendi).")
+
+
+def sniff_delimiter(text):
+    lines = [ln for ln in text.splitlines()[:50] if ln.strip()]
+    if not lines:
+        raise IngestError("Dosya boş.")
+    try:
+        return csv.Sniffer().sniff("\n".join(lines), delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        # Sniffer kararsızsa başlıkta en çok geçen ayraç
+        return max(DELIMITERS, key=lines[0].count)
+
+
+def _open_binary(source):
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, "rb"), True
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source, False
+
+
+def _read_arrow(source):
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            buf = pa.memory_map(str(source), "r")
+        elif hasattr(source, "getbuffer"):
+            buf = pa.BufferReader(pa.py_buffer(source.getbuffer()))
+        else:
+            buf = pa.BufferReader(source.read())
+        try:
+            table = ipc.open_file(buf).read_all()
+        except pa.ArrowInvalid:
+            buf.seek(0)
+            table = ipc.open_stream(buf).read_all()
+        return table.to_pandas()
+    except pa.ArrowException as e:
+        raise IngestError(f"Arrow dosyası okunamadı: {e}") from None
+
+
+def _read_parquet(source):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            return pq.read_table(str(source), memory_map=True).to_pandas()
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return pq.read_table(source).to_pandas()
+    except pa.ArrowException as e:
+        raise IngestError(f"Parquet dosyası okunamadı: {e}") from None
+
+
+def _read_delimited(fh, chunksize):
+    head = fh.read(SNIFF_BYTES)
+    fh.seek(0)
+    enc = sniff_encoding(head)
+    sample = codecs.getincrementaldecoder(enc)().decode(head, final=False)
+    sep = sniff_delimiter(sample)
+    # Tüm dosyayı okumadan önce başlığı doğrula
+    header = next(csv.reader(io.StringIO(sample), delimiter=sep))
+    validate_header([h.strip() for h in header])
+    text = io.TextIOWrapper(fh, encoding=enc, errors="strict", newline="")
+    try:
+        reader = pd.read_csv(
+            text, sep=sep, dtype=str, keep_default_na=False,
+            chunksize=chunksize, engine="c",
+        )
+        chunks = list(reader)
+    except UnicodeDecodeError as e:
+        raise IngestError(f"Kodlama hatası ({enc}): {e}") from None
+    except pd.errors.ParserError as e:
+        raise IngestError(f"Dosya ayrıştırılamadı (ayraç {sep!r}): {e}") from None
+    finally:
+        text.detach()
+    if not chunks:
+        return pd.DataFrame(columns=header)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def read_table(source, name=None, chunksize=CHUNK_ROWS):
+    """
+    CSV/TSV, Parquet veya Arrow IPC dosyasını oku. ``source`` bir yol ya da ikili
+    dosya nesnesi (ör. Streamlit ``UploadedFile``) olabilir. Biçim sihirli
+    baytlardan, gerekirse dosya adı uzantısından anlaşılır. Sonuç ``fillna("")``
+    edilmiştir; başlık doğrulanır, sorunlar ``IngestError`` olarak bildirilir.
+    """
+    name = str(name or getattr(source, "name", "") or source)
+    fh, owned = _open_binary(source)
+    try:
+        magic = fh.read(8)
+        fh.seek(0)
+        if magic.startswith(PARQUET_MAGIC):
+            df = _read_parquet(source)
+        elif magic.startswith(ARROW_MAGIC) or name.lower().endswith(ARROW_EXTS):
+            df = _read_arrow(source)
+        else:
+            return _read_delimited(fh, chunksize)
+    finally:
+        if owned:
+            fh.close()
+    validate_header(df.columns)
+    # Sözlük kodlu kolonlar kategorik gelir; "" yeni kategori olamayacağından önce metne çevrilir
+    for c in df.columns[[isinstance(t, pd.CategoricalDtype) for t in df.dtypes]]:
+        df[c] = df[c].astype(object)
+    return df.fillna("")
@@ -0,0 +1,162 @@
+"""
+Harita katmanı.
+
+Az sayıda olayda her olay kendi CircleMarker'ı ve gömülü popup'ı ile çizilir.
+Eşik aşıldığında (yüksek hacim) tüm noktalar tek bir FastMarkerCluster
+verisi olarak gönderilir: her satır ``[lat, lon, renk, satır id]``. Popup HTML
+gömülmez; tıklanan noktanın id'si ``st_folium`` dönüşünden okunur ve detay
+panelde gösterilir.
+
+Yoğunluk görünümü ham satırları değil, önceden toplanmış ızgara hücrelerini
+(``Aggregates.heat_points``) tek bir HeatMap katmanı olarak çizer.
+
+Komşu bağlantıları koordinat çifti başına bir kez ve ``MAX_NEIGHBOR_LINES``
+ile sınırlı çizilir.
+"""
+import html
+
+import folium
+import pandas as pd
+from folium.plugins import FastMarkerCluster, HeatMap, MarkerCluster
+
+HIGH_VOLUME_THRESHOLD = 2000
+# Komşu çizgileri üst sınırı: yüksek hacimde çizgiler sıkıştırılmış nokta verisini şişirmesin
+MAX_NEIGHBOR_LINES = 2000
+
+# Yüksek hacim modunda her satır için JS tarafında işaretçi üretir; id ve renk
+# feature.properties'e yazılır ki tıklamada toGeoJSON() ile geri dönsün
+_FAST_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 7, color: row[2], fill: true, fillOpacity: 0.9
+    });
+    marker.feature = {type: "Feature", properties: {id: row[3], color: row[2]}};
+    return marker;
+}
+"""
+
+
+def event_color(evt):
+    e = (evt or "").lower()
+    if "patlama" in e and "yangın" in e: return "orange"
+    if "kimyasal" in e: return "purple"
+    if "çökme" in e or "göçük" in e: return "darkblue"
+    if "kran" in e: return "cadetblue"
+    if "yangın" in e: return "red"
+    return "gray"
+
+
+def popup_html(r, C):
+    """Olay detayı HTML'i; yüklenen hücre değerleri kaçışlanır (işaretleme enjekte edilemez)."""
+    v = {k: html.escape(str(r[C[k]])) for k in (
+        "Name", "Sector", "Event", "Tarih", "IlIlce", "Addr", "Method", "Conf", "Cause", "PD", "BI", "Sources",
+    )}
+    return f"""
+    <div style='width: 360px'>
+      <b>{v['Name']}</b><br>
+      <i>{v['Sector']}</i><br><br>
+      <b>Olay:</b> {v['Event']}<br>
+      <b>Tarih:</b> {v['Tarih']}<br>
+      <b>İl/İlçe:</b> {v['IlIlce']}<br>
+      <b>Adres/OSB:</b> {v['Addr']} <small>(konum: {html.escape(str(r['_geo_level']))})</small><br>
+      <b>Doğrulama:</b> {v['Method']} ({v['Conf']})<br>
+      <b>Çıkış şekli:</b> {v['Cause']}<br>
+      <b>PD:</b> {v['PD']}<br>
+      <b>BI:</b> {v['BI']}<br>
+      <b>Kaynaklar:</b> {v['Sources']}
+    </div>
+    """
+
+
+def name_coords(df_geo, C):
+    """İsim -> ilk görülen koordinat."""
+    first = df_geo.drop_duplicates(subset=[C["Name"]])
+    return dict(zip(first[C["Name"]], zip(first["_lat"], first["_lon"])))
+
+
+def event_colors(events):
+    """Benzersiz olay türleri için bir kez renk hesapla."""
+    events = events.astype(str)
+    palette = {e: event_color(e) for e in events.unique()}
+    return events.map(palette)
+
+
+def add_markers(m, q_geo, C):
+    mc = MarkerCluster().add_to(m)
+    for _, r in q_geo.iterrows():
+        title = f"{r[C['Name']]} — {r[C['Event']]}"
+        folium.CircleMarker(
+            location=[r["_lat"], r["_lon"]],
+            radius=7,
+            color=event_color(r[C["Event"]]),
+            fill=True, fill_opacity=0.9,
+            popup=folium.Popup(popup_html(r, C), max_width=420),
+            tooltip=title
+        ).add_to(mc)
+
+
+def add_fast_points(m, q_geo, C):
+    data = list(zip(
+        q_geo["_lat"].round(5).tolist(),
+        q_geo["_lon"].round(5).tolist(),
+        event_colors(q_geo[C["Event"]]).tolist(),
+        q_geo.index.tolist(),
+    ))
+    FastMarkerCluster(data, callback=_FAST_CALLBACK).add_to(m)
+
+
+def add_neighbor_lines(m, q_geo, C, name_to_xy, key="Neighbors", limit=MAX_NEIGHBOR_LINES, **style):
+    """
+    ``C[key]`` kolonundaki bağlantıları tek bir çoklu çizgi olarak ekle. Her
+    koordinat çifti bir kez çizilir (A->B ile B->A ve aynı tesisin tekrar eden
+    olayları tek çizgi); en fazla ``limit`` çizgi. Çizilen çizgi sayısını döndürür.
+    """
+    if C[key] not in q_geo:
+        return 0
+    segments = {}
+    for lat1, lon1, cell in zip(q_geo["_lat"], q_geo["_lon"], q_geo[C[key]]):
+        if pd.isna(lat1) or pd.isna(lon1):
+            continue
+        a = (round(lat1, 5), round(lon1, 5))
+        for nb in str(cell).split(";"):
+            xy = name_to_xy.get(nb.strip())
+            if xy is None or pd.isna(xy[0]):
+                continue
+            b = (round(xy[0], 5), round(xy[1], 5))
+            if a != b:
+                segments.setdefault((min(a, b), max(a, b)), None)
+        if len(segments) >= limit:
+            break
+    if segments:
+        style = {"weight": 2, "opacity": 0.7, **style}
+        folium.PolyLine([[list(a), list(b)] for a, b in list(segments)[:limit]], **style).add_to(m)
+    return min(len(segments), limit)
+
+
+def build_map(q_geo, C, name_to_xy=None, show_neighbors=True, threshold=HIGH_VOLUME_THRESHOLD):
+    """``(harita, yüksek_hacim_mı)`` döndür."""
+    high_volume = len(q_geo) > threshold
+    m = folium.Map(location=[39.0, 35.0], zoom_start=6, control_scale=True, prefer_canvas=high_volume)
+    if high_volume:
+        add_fast_points(m, q_geo, C)
+    else:
+        add_markers(m, q_geo, C)
+    # Komşu bağlantıları: metinde açıkça belirtilenler düz, yarıçap içindekiler kesikli çizgi
+    if show_neighbors and name_to_xy:
+        add_neighbor_lines(m, q_geo, C, name_to_xy)
+        add_neighbor_lines(m, q_geo, C, name_to_xy, key="Nearby", color="gray", dash_array="6 6", weight=1)
+    return m, high_volume
+
+
+def build_heatmap(points):
+    """``[[lat, lon, sayı], ...]`` hücrelerinden yoğunluk haritası."""
+    m = folium.Map(location=[39.0, 35.0], zoom_start=6, control_scale=True)
+    if points:
+        HeatMap(points, radius=18, blur=14, min_opacity=0.3).add_to(m)
+    return m
+
+
+def clicked_row_id(map_state):
+    """``st_folium`` dönüşünden tıklanan noktanın satır id'si (yoksa None)."""
+    drawing = (map_state or {}).get("last_active_drawing") or {}
+    return (drawing.get("properties") or {}).get("id")
@@ -0,0 +1,284 @@
+"""
+Metinde AÇIKÇA belirtilen desenlerden tesis ilişkisi çıkarımı.
+
+Benzersiz tesis adları bir kez token'lara ayrılıp ters indekse (token ve
+ardışık token çifti -> adlar) konur. Her kural bir ad içinden hedef ifadeyi
+çıkarır; hedefi içeren adlar, ifadedeki en nadir token çiftinin listesi
+üzerinden bulunur ve yalnızca bu adaylarda ardışık token eşleşmesi doğrulanır.
+Firma adlarında tek tek sık geçen kelimeler ('tekstil', 'sanayi', ilk adlar)
+çift olarak nadir olduğundan aday sayısı veri boyutuyla büyümez.
+``NeighborLinker`` aynı ilişkileri ad kümesi değiştikçe artımlı günceller.
+
+Yeni desen eklemek için ``register_rule(LinkRule(...))`` yeterlidir.
+"""
+import re
+from dataclasses import dataclass
+from itertools import chain
+from typing import Callable
+
+import numpy as np
+
+from .spatial import GridIndex
+from .textutil import normalize_text
+
+
+@dataclass(frozen=True)
+class LinkRule:
+    """
+    ``pattern`` bir adda aranır; eşleşirse ``target(match, name)`` aranacak ifadeyi
+    döndürür. ``exclude_same`` True ise aynı deseni taşıyan adlar hedef sayılmaz
+    (ör. '(2. tesis)' yalnızca baz ada bağlanır).
+    """
+    name: str
+    pattern: re.Pattern
+    target: Callable[[re.Match, str], str]
+    exclude_same: bool = False
+
+
+LINK_RULES = [
+    # '(2. tesis)', '(3. tesis)' -> aynı adın baz hali
+    LinkRule(
+        "tesis",
+        re.compile(r"\(\s*\d+\.\s*tesis\s*\)", flags=re.IGNORECASE),
+        lambda m, nm: nm[:m.start()].strip(),
+        exclude_same=True,
+    ),
+    # '(X yakını)' -> X
+    LinkRule(
+        "yakini",
+        re.compile(r"\(([^)]+?)\s+yakını\)", flags=re.IGNORECASE),
+        lambda m, nm: m.group(1).strip(),
+    ),
+    # '(eski adı X)' / '(eski adı: X)' -> X
+    LinkRule(
+        "eski_adi",
+        re.compile(r"\(\s*eski\s+ad[ıi]\s*:?\s*([^)]+?)\s*\)", flags=re.IGNORECASE),
+        lambda m, nm: m.group(1).strip(),
+    ),
+]
+
+
+def register_rule(rule):
+    LINK_RULES.append(rule)
+
+
+class NameIndex:
+    """
+    Normalize edilmiş tesis adları üzerinde token ve ardışık token çifti -> konum
+    indeksi. Ad eklenebilir ve çıkarılabilir; konumlar yeniden numaralanmaz.
+    """
+
+    def __init__(self, names=()):
+        self.names = []
+        self._padded = []
+        self._postings = {}
+        self._pairs = {}
+        self.dead = 0
+        self.add(names)
+
+    def add(self, names):
+        """Adları ekle; konumlarını döndür."""
+        start = len(self.names)
+        for nm in names:
+            pos = len(self.names)
+            tokens = normalize_text(nm).split()
+            self.names.append(nm)
+            self._padded.append(" " + " ".join(tokens) + " ")
+            for tok in set(tokens):
+                self._postings.setdefault(tok, []).append(pos)
+            for pair in set(zip(tokens, tokens[1:])):
+                self._pairs.setdefault(pair, []).append(pos)
+        return range(start, len(self.names))
+
+    def discard(self, pos):
+        """Konumu sorgu sonuçlarından çıkar (liste girdileri yerinde kalır)."""
+        if self.names[pos] is not None:
+            self.names[pos] = None
+            self._padded[pos] = ""
+            self.dead += 1
+
+    def containing(self, phrase):
+        """``phrase`` token dizisini ardışık olarak içeren adların konumları."""
+        tokens = normalize_text(phrase).split()
+        if not tokens:
+            return []
+        if len(tokens) == 1:
+            return [pos for pos in self._postings.get(tokens[0], ()) if self._padded[pos]]
+        # Tek tek sık geçen token'lar ('tekstil', 'sanayi') çift olarak nadirdir;
+        # adaylar en nadir çiftin listesidir, ardışıklık metin üzerinde doğrulanır
+        rarest = min((self._pairs.get(p, ()) for p in zip(tokens, tokens[1:])), key=len)
+        needle = " " + " ".join(tokens) + " "
+        return [pos for pos in rarest if needle in self._padded[pos]]
+
+
+class NeighborLinker:
+    """
+    Ad kümesi değiştikçe ilişkileri artımlı güncelleyen ``infer_neighbors``.
+
+    Bir ilişki yalnızca iki adın kendisine bağlıdır (biri deseni taşır, diğeri
+    hedefi içerir); bu yüzden ``update`` yalnızca eklenen adların ilişkilerini
+    hesaplar ve çıkan adlarınkileri siler. Eklenen bir ad iki yönden bağlanır:
+    kaynak olarak hedefi indeksten aranır; hedef içeren taraf olarak ise adın
+    ardışık token dizileri mevcut kaynakların hedef sözlüğünde aranır.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = list(LINK_RULES if rules is None else rules)
+        self.index = NameIndex()
+        self.links = {}  # ad -> bağlı adlar
+        self._pos = {}  # ad -> indeks konumu
+        self._hits = {}  # ad -> kural başına desen eşleşmesi
+        self._targets = [{} for _ in self.rules]  # kural başına normalize hedef -> kaynak adlar
+        self._target_len = [0] * len(self.rules)
+        self._joined = {}
+
+    def __len__(self):
+        return len(self._pos)
+
+    def update(self, names):
+        """``names`` için satır başına ';' ile birleştirilmiş ilişkiler."""
+        unique = dict.fromkeys(names)
+        for nm in [nm for nm in self._pos if nm not in unique]:
+            self._remove(nm)
+        added = [nm for nm in unique if nm not in self._pos]
+        if added:
+            self._add(added)
+        joined = self._joined
+        for nm in unique:
+            if nm not in joined:
+                joined[nm] = "; ".join(sorted(self.links[nm]))
+        return [joined[nm] for nm in names]
+
+    def _link(self, a, b):
+        self.links[a].add(b)
+        self.links[b].add(a)
+        self._joined.pop(a, None)
+        self._joined.pop(b, None)
+
+    def _remove(self, nm):
+        self.index.discard(self._pos.pop(nm))
+        for r, (rule, m) in enumerate(zip(self.rules, self._hits.pop(nm))):
+            if m:
+                sources = self._targets[r].get(normalize_text(rule.target(m, nm)))
+                if sources is not None:
+                    sources.discard(nm)
+        for other in self.links.pop(nm):
+            self.links[other].discard(nm)
+            self._joined.pop(other, None)
+        self._joined.pop(nm, None)
+        # Silinenler çoğunluktaysa indeksi canlı adlarla yeniden kur
+        if self.index.dead > len(self._pos):
+            self.index = NameIndex(self._pos)
+            self._pos = {nm: pos for pos, nm in enumerate(self._pos)}
+
+    def _add(self, added):
+        for nm, pos in zip(added, self.index.add(added)):
+            self._pos[nm] = pos
+            self._hits[nm] = tuple(rule.pattern.search(nm) for rule in self.rules)
+            self.links[nm] = set()
+
+        # Mevcut kaynakların hedefini içeren yeni adlar
+        for r, rule in enumerate(self.rules):
+            targets, longest = self._targets[r], self._target_len[r]
+            if not targets:
+                continue
+            for nm in added:
+                if rule.exclude_same and self._hits[nm][r]:
+                    continue
+                tokens = normalize_text(nm).split()
+                for i in range(len(tokens)):
+                    for j in range(i + 1, min(len(tokens), i + longest) + 1):
+                        for src in targets.get(" ".join(tokens[i:j]), ()):
+                            if src != nm:
+                                self._link(src, nm)
+
+        # Yeni kaynaklar: hedefi içeren tüm adlar (yeniler dahil)
+        for r, rule in enumerate(self.rules):
+            lookups = {}
+            for nm in added:
+                m = self._hits[nm][r]
+                if not m:
+                    continue
+                key = normalize_text(rule.target(m, nm))
+                if not key:
+                    continue
+                if key not in lookups:
+                    found = (self.index.names[pos] for pos in self.index.containing(key))
+                    if rule.exclude_same:
+                        found = (other for other in found if not self._hits[other][r])
+                    lookups[key] = list(found)
+                for other in lookups[key]:
+                    if other != nm:
+                        self._link(nm, other)
+                self._targets[r].setdefault(key, set()).add(nm)
+                self._target_len[r] = max(self._target_len[r], key.count(" ") + 1)
+
+
+def infer_neighbors(df, C, rules=None):
+    """
+    Sadece metinde AÇIKÇA belirtilen desenlerle (halüsinasyonsuz) ilişki kur:
+    - '(2. tesis)' -> aynı adın baz hali
+    - '(... yakını)' -> parantez içinde 'yakını' geçen isim
+    - '(eski adı ...)' -> eski ad
+    Üretilen 'Çevre Tesisler' kolonuna ';' ile yazılır. Aynı adı taşıyan
+    satırlar (aynı tesisin tekrar eden olayları) bir kez işlenir. Tekrarlı
+    çağrılar için ``NeighborLinker`` kullanın.
+    """
+    return NeighborLinker(rules).update(df[C["Name"]].astype(str).tolist())
+
+
+def split_neighbors(s):
+    return [x.strip() for x in str(s).split(";") if x.strip()]
+
+
+def merge_neighbor_lists(*columns):
+    """Aynı uzunluktaki ';' ayrılmış komşu kolonlarını satır satır birleştir (tekrarsız)."""
+    merged = []
+    for cells in zip(*columns):
+        items = set()
+        for cell in cells:
+            items.update(split_neighbors(cell))
+        merged.append("; ".join(sorted(items)))
+    return merged
+
+
+def proximity_neighbors(names, index, km, limit=None):
+    """
+    Mekânsal indeksten ``km`` içindeki tesis adları (';' ile, yakından uzağa).
+    ``index`` konumları ``names`` sırasıyla hizalı olmalıdır; aynı adı taşıyan
+    satırlar (aynı tesisin başka olayları) komşu sayılmaz. ``limit`` aynı ad
+    elenip tekrarlar atıldıktan sonra uygulanır.
+
+    Gazetteer birçok satırı aynı site merkezine koyduğundan eşleştirme benzersiz
+    koordinatlar üzerinde yapılır; her koordinattaki adlar sonra dağıtılır.
+    """
+    names = [str(n) for n in names]
+    out = [""] * len(names)
+    rows = np.flatnonzero(~(np.isnan(index.lat) | np.isnan(index.lon)))
+    if not len(rows):
+        return out
+    coords, inverse = np.unique(
+        np.column_stack((index.lat[rows], index.lon[rows])), axis=0, return_inverse=True,
+    )
+    inverse = inverse.reshape(-1)
+    at = [{} for _ in range(len(coords))]  # koordinat -> adlar (ilk görülme sırasıyla)
+    for r, u in zip(rows.tolist(), inverse.tolist()):
+        at[u].setdefault(names[r], None)
+    pairs = GridIndex(coords[:, 0], coords[:, 1], cell_km=index.cell_km).pairs_within(km)
+
+    # Koordinat başına en yakın limit + 1 farklı ad yeter: satırın kendi adı en
+    # fazla bir tanesini eler
+    heads = {}
+    for r, u in zip(rows.tolist(), inverse.tolist()):
+        head = heads.get(u)
+        if head is None:
+            near = {}
+            for v in chain((u,), pairs.get(u, ()).tolist()):
+                near.update(at[v])
+                if limit is not None and len(near) > limit:
+                    break
+            head = heads[u] = list(near) if limit is None else list(near)[:limit + 1]
+        nm = names[r]
+        near = [x for x in head if x != nm]
+        out[r] = "; ".join(near if limit is None else near[:limit])
+    return out
@@ -0,0 +1,371 @@
+"""
+Aşamalı zenginleştirme hattı: yükle -> zenginleştir -> geocode -> indeks.
+
+Her aşamanın çıktısı, girdisinin içerik özetiyle (hash) anahtarlanıp sınırlı
+boyutlu bir LRU önbellekte tutulur. Yalnızca ham baytlar bir kez özetlenir;
+sonraki aşamaların anahtarları önceki anahtardan türetilir, böylece büyük
+tablolar her yeniden çalıştırmada tekrar özetlenmez.
+
+Birkaç satırı farklı bir dosya yüklendiğinde yalnızca değişen satırlar
+yeniden işlenir: tipleme (tarih/doğruluk/İl-İlçe ayrıştırma) ve geocode
+satır özetiyle önbelleklidir, komşu çıkarımı (``NeighborLinker``) yalnızca
+eklenen ve çıkan tesis adlarının ilişkilerini günceller. Kategorik
+dönüşümler gibi kolon bazındaki ucuz işlemler tüm tabloda tekrarlanır.
+
+Özet küpleri (``Dataset.aggregates``) ilk kullanımda kurulur; olay deposu
+yalnızca büyüdüğünde önceki özete eklenir.
+
+Önbellekteki tablolar paylaşılır; çağıranlar bunları yerinde değiştirmemelidir.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import Aggregates
+from .gazetteer import CENTROID_LEVELS, mentions_site
+from .geocache import geocode_addresses
+from .ingest import TYPED_INPUT_KEYS, ensure_columns, normalize_cols, read_table, type_frame, typed_columns
+from .neighbors import NeighborLinker, merge_neighbor_lists, proximity_neighbors
+from .profiling import stage
+from .query import QueryEngine
+from .spatial import GridIndex
+
+# Yakınlık komşuları: satır başına en fazla bu kadar (en yakınlar)
+PROXIMITY_LIMIT = 25
+
+
+def content_hash(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    for p in parts:
+        h.update(p if isinstance(p, bytes) else str(p).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def file_hash(path, chunk=1 << 20):
+    """Dosyayı belleğe almadan özetle; ``content_hash(dosya baytları)`` ile aynı sonuç."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(chunk), b""):
+            h.update(block)
+    h.update(b"\x00")
+    return h.hexdigest()
+
+
+def row_hashes(df, cols):
+    """Seçili kolonların satır bazında 64 bit özetleri."""
+    return pd.util.hash_pandas_object(df[cols].astype(str), index=False).to_numpy()
+
+
+class LRUCache:
+    """En son kullanılan ``maxsize`` kaydı tutan basit önbellek (isabet sayaçlı)."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+class RowMemo:
+    """
+    Satır özeti -> türetilmiş kolonlar tablosu (vektörel arama). En fazla
+    ``maxsize`` satır tutulur; taşınca en eski eklenenler düşer.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._table = None
+
+    def __len__(self):
+        return 0 if self._table is None else len(self._table)
+
+    def compute(self, keys, df, fn):
+        """``fn(df[eksik satırlar])`` yalnızca önbellekte olmayan satırlar için çağrılır."""
+        if self._table is None:
+            pos = np.full(len(keys), -1)
+        else:
+            pos = self._table.index.get_indexer(keys)
+        miss = pos < 0
+        n_miss = int(miss.sum())
+        self.hits += len(keys) - n_miss
+        self.misses += n_miss
+        parts = []
+        if n_miss < len(keys):
+            parts.append(self._table.iloc[pos[~miss]].set_axis(df.index[~miss]))
+        if n_miss:
+            fresh = fn(df[miss])
+            parts.append(fresh)
+            self._put(keys[miss], fresh)
+        out = parts[0] if len(parts) == 1 else pd.concat(parts)
+        return out.reindex(df.index)
+
+    def _put(self, keys, fresh):
+        fresh = fresh.set_axis(pd.Index(keys))
+        table = fresh if self._table is None else pd.concat([self._table, fresh])
+        table = table[~table.index.duplicated(keep="last")]
+        self._table = table.iloc[-self.maxsize:]
+
+
+def geocode_df(df, C, gazetteer, store=None, provider=None, memo=None):
+    """
+    ``_lat``, ``_lon``, ``_geo_level`` kolonları eklenmiş kopya döndür.
+    Lat/Lon kolonları doluysa onlar kullanılır; değilse gazetteer (site -> ilçe ->
+    il). Hiçbir düzeyde eşleşmeyenler, yalnızca il merkezine düşenler ve
+    gazetteer'da olmayan bir OSB/sanayi sitesini anan adresler önce
+    depo/sağlayıcıya sorulur; merkez yalnızca yedek olarak kalır. ``memo``
+    (LRUCache) verilirse adres + İl/İlçe özeti aynı olan satırlar yeniden çözülmez.
+    """
+    lat = df[C["Lat"]].astype(str).str.strip()
+    lon = df[C["Lon"]].astype(str).str.strip()
+    has_latlon = lat.ne("").sum() and lon.ne("").sum()
+    out = df.copy()
+    if has_latlon:
+        out["_lat"] = pd.to_numeric(lat, errors="coerce")
+        out["_lon"] = pd.to_numeric(lon, errors="coerce")
+        out["_geo_level"] = out["_lat"].notna().map({True: "explicit", False: None})
+        return out
+
+    addrs = df[C["Addr"]].astype(str).tolist()
+    places = df[C["IlIlce"]].astype(str).tolist()
+    keys = row_hashes(df, [C["Addr"], C["IlIlce"]]) if memo is not None else [None] * len(addrs)
+    coords = [memo.get(k) if memo is not None else None for k in keys]
+    todo = [i for i, c in enumerate(coords) if c is None]
+
+    # Önce çevrimdışı gazetteer: OSB/sanayi -> ilçe -> il merkezi (benzersiz çiftler bir kez)
+    local = {pair: gazetteer.lookup(*pair) for pair in dict.fromkeys((addrs[i], places[i]) for i in todo)}
+    # Kalıcı depo -> sağlayıcıya gidenler: hiçbir düzeyde eşleşmeyenler, yalnızca il
+    # merkezine düşenler (ilçe tablosu tüm ilçeleri kapsamaz) ve gazetteer'da olmayan
+    # bir siteyi anıp ilçe merkezine düşenler. Merkez yalnızca sağlayıcı bulamazsa kalır
+    misses = list(dict.fromkeys(
+        a for (a, _), hit in local.items()
+        if hit is None or hit[2] == "il" or (hit[2] in CENTROID_LEVELS and mentions_site(a))
+    ))
+    with stage("geocode.remote", len(misses)):
+        remote = geocode_addresses(misses, store, provider) if misses else {}
+
+    for i in todo:
+        hit = local[(addrs[i], places[i])]
+        fallback = False
+        if addrs[i] in remote:
+            lat_, lon_ = remote[addrs[i]]
+            if lat_ is not None:
+                hit = (lat_, lon_, "geocode")
+            elif hit is None:
+                hit = (None, None, None)
+            else:
+                fallback = True  # sağlayıcı bulamadı; merkez geçici olarak kabul edilir
+        coords[i] = hit
+        # Çözülemeyenler ve merkeze geri düşenler satır önbelleğine yazılmaz
+        # (depodaki negatif kayıt yeterli; süresi dolunca yeniden denenir)
+        if memo is not None and hit[0] is not None and not fallback:
+            memo.put(keys[i], hit)
+
+    out["_lat"] = [c[0] for c in coords]
+    out["_lon"] = [c[1] for c in coords]
+    out["_geo_level"] = [c[2] for c in coords]
+    return out
+
+
+class Dataset:
+    """Hattın son çıktısı: zenginleştirilmiş tablo ve tembel kurulan indeksler."""
+
+    def __init__(self, key, df, C, report):
+        self.key = key
+        self.df = df
+        self.C = C
+        self.report = report
+        self._proximity = LRUCache(4)
+        self._agg_base = None
+
+    @cached_property
+    def df_geo(self):
+        return self.df.dropna(subset=["_lat", "_lon"])
+
+    @cached_property
+    def date_order(self):
+        # Tarihe göre azalan sıra (boş tarihler sonda)
+        return self.df["_date"].sort_values(ascending=False, kind="stable").index.to_numpy()
+
+    @cached_property
+    def name_coords(self):
+        """Tesis adı -> ilk koordinat (komşu çizgileri için; filtreden bağımsız)."""
+        from .maplayer import name_coords  # folium'u yalnızca harita çizilirken yükle
+
+        return name_coords(self.df_geo, self.C)
+
+    @cached_property
+    def query(self):
+        with stage("query_index", len(self.df)):
+            return QueryEngine(self.df, self.C)
+
+    @cached_property
+    def aggregates(self):
+        # Önceki sürümün özeti varsa yalnızca yeni satırlar eklenir
+        if self._agg_base is not None:
+            base, n = self._agg_base
+            self._agg_base = None
+            with stage("aggregates.update", len(self.df) - n):
+                return base.updated(self.df.iloc[n:], self.C)
+        with stage("aggregates", len(self.df)):
+            return Aggregates.from_frame(self.df, self.C)
+
+    def extend_from(self, prev):
+        """``prev`` bu tablonun önekiyse (yalnızca ekleme) onun özetini temel al."""
+        agg = prev.__dict__.get("aggregates")
+        n = len(prev.df)
+        if agg is None or n > len(self.df) or "_event_id" not in self.df:
+            return
+        if np.array_equal(prev.df["_event_id"].to_numpy(), self.df["_event_id"].to_numpy()[:n]):
+            self._agg_base = (agg, n)
+
+    @cached_property
+    def spatial(self):
+        # İl/ilçe merkezine düşen satırlar yakınlık için yeterince kesin değil
+        precise = ~self.df["_geo_level"].isin(CENTROID_LEVELS)
+        return GridIndex(self.df["_lat"].where(precise).to_numpy(), self.df["_lon"].where(precise).to_numpy())
+
+    def with_proximity(self, km, limit=PROXIMITY_LIMIT):
+        """
+        ``km`` içindeki tesislerin ayrı "Yakın Tesisler" kolonuna yazıldığı tablo
+        (yarıçap başına önbellekli). Metinden çıkarılan "Çevre Tesisler" değişmez.
+        """
+        if not km:
+            return self.df
+        df = self._proximity.get(km)
+        if df is None:
+            col = self.C["Nearby"]
+            with stage("proximity", len(self.df)):
+                near = proximity_neighbors(self.df[self.C["Name"]], self.spatial, km, limit=limit)
+            df = self.df.assign(**{col: merge_neighbor_lists(self.df[col], near)})
+            self._proximity.put(km, df)
+        return df
+
+
+class Pipeline:
+    def __init__(self, gazetteer, store=None, provider=None, max_entries=2, max_rows=500_000):
+        self.gazetteer = gazetteer
+        self.store = store
+        self.provider = provider
+        self.caches = {
+            "load": LRUCache(max_entries),
+            "enrich": LRUCache(max_entries),
+            "geocode": LRUCache(max_entries),
+            "dataset": LRUCache(max_entries),
+        }
+        self.typed_rows = RowMemo(max_rows)
+        self.geocode_rows = LRUCache(max_rows)
+        self.linker = NeighborLinker()
+        self.lineages = LRUCache(max_entries)
+        self._lock = threading.Lock()
+
+    def _stage(self, name, key, fn):
+        cache = self.caches[name]
+        value = cache.get(key)
+        if value is None:
+            with stage(name):
+                value = fn()
+            cache.put(key, value)
+        return value
+
+    def load(self, key, source, name):
+        return self._stage("load", key, lambda: read_table(source, name=name))
+
+    def enrich(self, key, df):
+        def run():
+            out = ensure_columns(df.copy())
+            C = normalize_cols(out)
+            # Tipleme: tarih (datetime64), kategorik kolonlar, İl/İlçe ayrımı, sayısal doğruluk.
+            # Satır bazındaki ayrıştırma yalnızca önbellekte olmayan satırlar için yapılır
+            with stage("type_frame", len(out)):
+                keys = row_hashes(out, [C[k] for k in TYPED_INPUT_KEYS])
+                typed = self.typed_rows.compute(keys, out, lambda part: typed_columns(part, C))
+                out, report = type_frame(out, C, typed)
+            # Neighbors (sadece açıkça belirtilen desenlerden); yalnızca eklenen/çıkan adlar
+            # yeniden bağlanır. Kullanıcı kolonu doluysa onunla birleştirilir
+            with stage("infer_neighbors", len(out)):
+                inferred = pd.Series(self.linker.update(out[C["Name"]].astype(str).tolist()), index=out.index)
+                given = out[C["Neighbors"]].astype(str).str.strip().ne("")
+                if given.any():
+                    inferred[given] = merge_neighbor_lists(out.loc[given, C["Neighbors"]], inferred[given])
+                out[C["Neighbors"]] = inferred
+            return out, C, report
+        return self._stage("enrich", key, run)
+
+    def geocode(self, key, df, C):
+        return self._stage("geocode", key, lambda: geocode_df(
+            df, C, self.gazetteer, self.store, self.provider, memo=self.geocode_rows,
+        ))
+
+    def run(self, raw, name=""):
+        """Ham dosya baytlarından ``Dataset`` üret; aynı içerik için önbellekten döner."""
+        return self._run(content_hash(raw), lambda: io.BytesIO(raw), name)
+
+    def run_path(self, path, name=None):
+        """
+        Dosyayı yolundan işle (komut satırı). Özet dosya akışla hesaplanır;
+        Parquet/Arrow bellek eşlemeli okunur, baytlar ayrıca kopyalanmaz.
+        """
+        path = str(path)
+        return self._run(file_hash(path), lambda: path, name or path)
+
+    def _run(self, k_load, source, name):
+        with self._lock:
+            ds = self.caches["dataset"].get(k_load)
+            if ds is not None:
+                return ds
+            df = self.load(k_load, source(), name)
+            return self._finish(k_load, df)
+
+    def run_frame(self, key, load, lineage=None):
+        """
+        ``load()`` ile üretilen tablodan (ör. olay deposu sorgusu) ``Dataset``
+        üret. ``key`` tablonun içeriğini temsil etmelidir (ör.
+        ``EventStore.version()``); önbellekteyse ``load`` hiç çağrılmaz.
+        Aynı ``lineage`` içinde tablo yalnızca büyüyorsa özetler artımlı güncellenir.
+        """
+        k_load = content_hash("frame", key)
+        with self._lock:
+            ds = self.caches["dataset"].get(k_load)
+            if ds is not None:
+                return ds
+            ds = self._finish(k_load, self._stage("load", k_load, load))
+            if lineage is not None:
+                prev = self.lineages.get(lineage)
+                if prev is not None:
+                    ds.extend_from(prev)
+                self.lineages.put(lineage, ds)
+            return ds
+
+    def _finish(self, k_load, df):
+        k_enrich = content_hash("enrich", k_load)
+        df, C, report = self.enrich(k_enrich, df)
+        k_geo = content_hash("geocode", k_enrich)
+        df = self.geocode(k_geo, df, C)
+        ds = Dataset(k_geo, df, C, report)
+        self.caches["dataset"].put(k_load, ds)
+        return ds
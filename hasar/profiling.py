@@ -0,0 +1,130 @@
+"""
+Hafif, isteğe bağlı aşama ölçümü.
+
+Kapalıyken ``stage(...)`` paylaşılan boş bir bağlam döndürür (tek bir
+ContextVar okuması); kod içindeki ölçüm noktaları bu yüzden her zaman yerinde
+kalabilir. Açıkken (``activate(Profiler(...))``) her aşama için duvar saati
+süresi, satır sayısı ve aşama sonundaki bellek (RSS) kaydedilir.
+``Profiler.finish`` çalıştırma özetini (aşamalar, önbellek isabet/ıska
+oranları, bellek) döndürür ve istenirse JSON-lines günlüğüne ekler.
+
+Önbellek sayaçları süreç genelindedir; aynı anda çalışan oturumlar varsa
+çalıştırma başına farklar yaklaşıktır.
+"""
+import contextvars
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_LOG_PATH = os.environ.get(
+    "HASAR_PROFILE_LOG", str(Path(__file__).resolve().parent.parent / "profile.jsonl")
+)
+
+_current = contextvars.ContextVar("hasar_profiler", default=None)
+_NULL = nullcontext()
+
+
+def rss_mb():
+    """Anlık yerleşik bellek (MB); ``/proc`` yoksa tepe değer."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, AttributeError):
+        return peak_mb()
+
+
+def peak_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt döndürür
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def cache_counters(pipeline=None, geocode_store=None):
+    """``{önbellek adı: (isabet, ıska)}`` anlık görüntüsü."""
+    out = {}
+    if pipeline is not None:
+        for name, cache in pipeline.caches.items():
+            out[f"pipeline.{name}"] = (cache.hits, cache.misses)
+        out["typed.rows"] = (pipeline.typed_rows.hits, pipeline.typed_rows.misses)
+        out["geocode.rows"] = (pipeline.geocode_rows.hits, pipeline.geocode_rows.misses)
+    if geocode_store is not None:
+        out["geocode.store"] = (geocode_store.hits, geocode_store.misses)
+    return out
+
+
+def activate(profiler):
+    """Bu iş parçacığı/bağlam için etkin ölçeri ayarla (``None`` = kapalı)."""
+    _current.set(profiler)
+    if profiler is not None:
+        profiler.start()
+    return profiler
+
+
+def stage(name, rows=None):
+    """Etkin ölçer varsa aşamayı ölç; yoksa boş bağlam."""
+    profiler = _current.get()
+    if profiler is None:
+        return _NULL
+    return profiler.stage(name, rows)
+
+
+class Profiler:
+    def __init__(self, counters=None, log_path=None):
+        self.counters = counters  # () -> cache_counters(...) çıktısı
+        self.log_path = log_path
+        self.stages = []
+        self._depth = 0
+
+    def start(self):
+        self.stages = []
+        self._t0 = time.perf_counter()
+        self._before = self.counters() if self.counters else {}
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        record = {"stage": name, "depth": self._depth, "rows": rows}
+        self.stages.append(record)  # başlangıç sırası korunur (iç içe aşamalar için)
+        self._depth += 1
+        t0 = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            record["seconds"] = round(time.perf_counter() - t0, 6)
+            record["rss_mb"] = rss_mb()
+
+    def finish(self, **extra):
+        """Çalıştırma özetini döndür, günlüğe ekle ve ölçeri devre dışı bırak."""
+        after = self.counters() if self.counters else {}
+        caches = {}
+        for name, (hits, misses) in after.items():
+            h0, m0 = self._before.get(name, (0, 0))
+            h, m = hits - h0, misses - m0
+            caches[name] = {"hits": h, "misses": m, "hit_rate": round(h / (h + m), 3) if h + m else None}
+        report = {
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "total_seconds": round(time.perf_counter() - self._t0, 6),
+            "stages": self.stages,
+            "caches": caches,
+            "rss_mb": rss_mb(),
+            "peak_mb": peak_mb(),
+            **extra,
+        }
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(report, ensure_ascii=False) + "\n")
+        if _current.get() is self:
+            _current.set(None)
+        return report
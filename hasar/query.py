@@ -0,0 +1,83 @@
+"""
+Kenar çubuğu filtreleri için veri seti başına bir kez kurulan sorgu motoru.
+
+- İl/İlçe ve Olay Türü: kategorik tamsayı kodları; seçim, kategori başına
+  bir arama tablosu (lut) ile ``lut[codes]`` olarak tek geçişte maskeye döner.
+- Doğrulama: her harf (A, B) için önceden hesaplanmış satır bit maskesi.
+- Tarih: sıralı tarih dizisi; aralık iki ikili aramayla (searchsorted) bulunur.
+
+Filtreler birleştirilirken maskeler AND'lenir; tüm değerlerin seçili olduğu
+filtreler hiç hesaplanmaz.
+"""
+import numpy as np
+import pandas as pd
+
+METHOD_LETTERS = ("A", "B")
+
+
+class QueryEngine:
+    def __init__(self, df, C):
+        self.n = len(df)
+        self._codes = {}
+        self._cats = {}
+        for key in ("IlIlce", "Event"):
+            s = df[C[key]]
+            if not isinstance(s.dtype, pd.CategoricalDtype):
+                s = s.astype(str).astype("category")
+            self._codes[key] = s.cat.codes.to_numpy()
+            self._cats[key] = pd.Index(s.cat.categories)
+
+        # Doğrulama: 'A', 'B', 'A/B' gibi değerlerde harf bazında maske (içerir semantiği)
+        m = df[C["Method"]].astype(str).str.upper()
+        uniq = pd.Index(m.unique())
+        codes = uniq.get_indexer(m)
+        self._method = {
+            letter: np.asarray([letter in u for u in uniq], dtype=bool)[codes]
+            for letter in METHOD_LETTERS
+        }
+
+        # Tarih: NaT olmayan satırların tarih sırası
+        dates = df["_date"].to_numpy(dtype="datetime64[ns]")
+        valid = np.flatnonzero(~np.isnat(dates))
+        order = valid[np.argsort(dates[valid], kind="stable")]
+        self._date_pos = order
+        self._date_sorted = dates[order]
+
+    def values(self, key):
+        """Seçim kutusu için boş olmayan değerler (sıralı)."""
+        return sorted(v for v in self._cats[key] if str(v).strip())
+
+    def _isin(self, key, selected):
+        cats = self._cats[key]
+        lut = np.zeros(len(cats) + 1, dtype=bool)  # son eleman: kod -1 (eksik)
+        idx = cats.get_indexer(list(selected))
+        lut[idx[idx >= 0]] = True
+        return lut[self._codes[key]]
+
+    def _date_mask(self, start, end):
+        lo = np.searchsorted(self._date_sorted, np.datetime64(pd.Timestamp(start), "ns"), side="left")
+        hi = np.searchsorted(self._date_sorted, np.datetime64(pd.Timestamp(end), "ns"), side="right")
+        mask = np.zeros(self.n, dtype=bool)
+        mask[self._date_pos[lo:hi]] = True
+        return mask
+
+    def mask(self, date_range=None, cities=None, events=None, methods=None):
+        """Satır maskesi. Boş/None filtreler uygulanmaz (kenar çubuğu davranışı)."""
+        parts = []
+        if date_range is not None:
+            parts.append(self._date_mask(*date_range))
+        for key, selected in (("IlIlce", cities), ("Event", events)):
+            # Tüm kategoriler seçiliyse filtre etkisizdir
+            if selected and not set(self._cats[key]).issubset(selected):
+                parts.append(self._isin(key, selected))
+        if methods:
+            mm = np.zeros(self.n, dtype=bool)
+            for letter in methods:
+                mm |= self._method.get(letter, False)
+            parts.append(mm)
+        if not parts:
+            return np.ones(self.n, dtype=bool)
+        out = parts[0].copy()
+        for p in parts[1:]:
+            out &= p
+        return out
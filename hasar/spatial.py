@@ -0,0 +1,130 @@
+"""
+Izgara (grid) tabanlı mekânsal indeks.
+
+Noktalar sabit boyutlu enlem/boylam hücrelerine kovalanır. Yarıçap sorgusu
+yalnızca yarıçapı kapsayan hücrelerdeki adaylara haversine uygular; k-en-yakın
+sorgusu hücre halkalarını dışa doğru genişletir. Tüm çiftler hiçbir zaman
+hesaplanmaz.
+"""
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = math.pi * EARTH_RADIUS_KM / 180
+_BLOCK = 512
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Vektörel haversine (derece girdisi, km çıktısı)."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class GridIndex:
+    def __init__(self, lat, lon, cell_km=5.0):
+        """
+        ``lat``/``lon``: aynı uzunlukta diziler; NaN olan konumlar indekse alınmaz.
+        Sorgular bu dizilerdeki konumları (0..n-1) döndürür.
+        """
+        self.lat = np.asarray(lat, dtype="float64")
+        self.lon = np.asarray(lon, dtype="float64")
+        self.cell_km = float(cell_km)
+        valid = ~(np.isnan(self.lat) | np.isnan(self.lon))
+        # Boylam derecesi en yüksek enlemde en kısadır; hücreyi ona göre seç ki
+        # hücre her yerde en az cell_km genişliğinde olsun
+        max_abs_lat = float(np.abs(self.lat[valid]).max()) if valid.any() else 0.0
+        self._dlat = self.cell_km / KM_PER_DEG_LAT
+        self._dlon = self._dlat / max(math.cos(math.radians(min(max_abs_lat, 89.0))), 1e-6)
+
+        self._buckets = {}
+        pos = np.flatnonzero(valid)
+        ci = np.floor(self.lat[pos] / self._dlat).astype("int64")
+        cj = np.floor(self.lon[pos] / self._dlon).astype("int64")
+        order = np.lexsort((cj, ci))
+        pos, ci, cj = pos[order], ci[order], cj[order]
+        if len(pos):
+            breaks = np.flatnonzero((np.diff(ci) != 0) | (np.diff(cj) != 0)) + 1
+            for chunk in np.split(np.arange(len(pos)), breaks):
+                self._buckets[(int(ci[chunk[0]]), int(cj[chunk[0]]))] = pos[chunk]
+
+    def __len__(self):
+        return sum(len(b) for b in self._buckets.values())
+
+    def _cell(self, lat, lon):
+        return int(math.floor(lat / self._dlat)), int(math.floor(lon / self._dlon))
+
+    def _gather(self, cells):
+        parts = [self._buckets[c] for c in cells if c in self._buckets]
+        return np.concatenate(parts) if parts else np.empty(0, dtype="int64")
+
+    def _span(self, km):
+        return int(math.ceil(km / self.cell_km))
+
+    def radius(self, lat, lon, km):
+        """``(lat, lon)`` noktasına ``km`` içindeki konumlar ve mesafeler (yakından uzağa)."""
+        ci, cj = self._cell(lat, lon)
+        r = self._span(km)
+        cand = self._gather((i, j) for i in range(ci - r, ci + r + 1) for j in range(cj - r, cj + r + 1))
+        d = haversine_km(lat, lon, self.lat[cand], self.lon[cand])
+        keep = d <= km
+        cand, d = cand[keep], d[keep]
+        order = np.argsort(d, kind="stable")
+        return cand[order], d[order]
+
+    def knn(self, lat, lon, k):
+        """En yakın ``k`` konum ve mesafeleri; hücre halkaları dışa doğru taranır."""
+        ci, cj = self._cell(lat, lon)
+        total = len(self)
+        k = min(k, total)
+        if k <= 0:
+            return np.empty(0, dtype="int64"), np.empty(0)
+        found, dists = [], []
+        ring = 0
+        while True:
+            if ring == 0:
+                cells = [(ci, cj)]
+            else:
+                cells = [(ci + di, cj + dj)
+                         for di in range(-ring, ring + 1) for dj in range(-ring, ring + 1)
+                         if max(abs(di), abs(dj)) == ring]
+            cand = self._gather(cells)
+            if len(cand):
+                found.append(cand)
+                dists.append(haversine_km(lat, lon, self.lat[cand], self.lon[cand]))
+            n = sum(len(f) for f in found)
+            if n >= k:
+                d = np.concatenate(dists)
+                kth = np.partition(d, k - 1)[k - 1]
+                # Bir sonraki halkadaki her nokta en az ring * cell_km uzaktadır
+                if kth <= ring * self.cell_km or n == total:
+                    cand = np.concatenate(found)
+                    order = np.argsort(d, kind="stable")[:k]
+                    return cand[order], d[order]
+            ring += 1
+
+    def pairs_within(self, km, limit=None):
+        """
+        Her konum için ``km`` içindeki diğer konumlar (kendisi hariç, yakından uzağa).
+        ``{konum: ndarray}`` döndürür; ``limit`` verilirse en yakın ``limit`` tanesi.
+        Hesap hücre bazında topludur: bir hücredeki tüm noktalar komşu hücrelerin
+        adaylarıyla toplu matris işlemleriyle karşılaştırılır.
+        """
+        r = self._span(km)
+        out = {}
+        for (ci, cj), members in self._buckets.items():
+            cand = self._gather((i, j) for i in range(ci - r, ci + r + 1) for j in range(cj - r, cj + r + 1))
+            # Yoğun hücrelerde matrisi sınırlı tutmak için satır blokları
+            for start in range(0, len(members), _BLOCK):
+                block = members[start:start + _BLOCK]
+                d = haversine_km(self.lat[block][:, None], self.lon[block][:, None],
+                                 self.lat[cand][None, :], self.lon[cand][None, :])
+                for row, p in enumerate(block):
+                    keep = (d[row] <= km) & (cand != p)
+                    hits, hd = cand[keep], d[row][keep]
+                    order = np.argsort(hd, kind="stable")
+                    if limit is not None:
+                        order = order[:limit]
+                    out[int(p)] = hits[order]
+        return out
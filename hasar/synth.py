@@ -0,0 +1,133 @@
+"""
+Gömülü listeyle aynı şemada sentetik olay verisi üretici (ölçek testleri için).
+
+Yer bilgileri paket gazetteer'ından gelir (OSB/sanayi sitesi adresleri, ilçe ve
+il merkezleri). Tesis adları Türkçe firma adı kalıplarından üretilir; belirli
+oranlarda ``(2. tesis)``, ``(X yakını)`` ve ``(eski adı X)`` desenleri, karışık
+tarih/doğruluk biçimleri ve İl/İlçe'si boş (gazetteer'ın çözemediği) satırlar
+eklenir. Aynı ``seed`` ile çıktı birebir aynıdır.
+"""
+import numpy as np
+import pandas as pd
+
+from .gazetteer import DEFAULT_PATH, SITE_LEVELS
+
+COLUMNS = [
+    "Tarih", "İl/İlçe", "OSB/Mevki (Parsel/Adres)", "Tesis Adı (Alternatifler)",
+    "Sektör/Tip", "Olay Türü", "Doğrulama Yöntemi (A/B)", "Doğruluk Oranı", "Kaynaklar",
+]
+
+NAME_WORDS = (
+    "Akdeniz Anadolu Ege Marmara Karadeniz Toros Yıldız Doğan Özkan Başak Çelik Güneş Ulusoy "
+    "Şahin Ertuğ Kaya Aydın Öztürk Demir Yılmaz Arslan Koç Erdem Kılıç Akın Tekin Güven Işık "
+    "Ünal Önder Polat Gür Tuna Bora Ilgaz Kartal Sönmez Yücel Eren Çağlar"
+).split()
+SECTORS = {
+    "Tekstil": "Tekstil", "Plastik / Ambalaj": "Plastik", "Metal / Makine": "Makina",
+    "Kimya": "Kimya", "Gıda": "Gıda", "Mobilya": "Mobilya", "Geri Dönüşüm": "Geri Dönüşüm",
+    "Otomotiv Yan Sanayi": "Otomotiv", "Kağıt / Ambalaj": "Kağıt", "Elektronik": "Elektronik",
+    "Depo / Lojistik": "Lojistik", "Alüminyum / Ekstrüzyon": "Alüminyum",
+}
+SUFFIXES = ("Sanayi ve Ticaret A.Ş.", "Sanayi ve Ticaret Ltd. Şti.", "San. Tic. A.Ş.", "İthalat İhracat Ltd. Şti.")
+EVENTS = {
+    "Yangın": 0.80, "Patlama + Yangın": 0.06, "Kimyasal Sızıntı": 0.05,
+    "Kazan/Boiler Patlağı": 0.03, "Çökme": 0.03, "Kimyasal Maruziyet (Zehirlenme)": 0.03,
+}
+SOURCES = ("AA", "DHA", "İHA", "Hürriyet", "Sabah", "Milliyet", "TRT Haber", "Valilik (X)", "İtfaiye (X)", "Yerel Haber")
+STREETS = ("Atatürk", "Cumhuriyet", "İstiklal", "Fatih", "Yıldırım", "Gazi", "Barış", "Sanayi", "Org. San.", "Çamlık")
+
+# Desen ve biçim oranları
+P_SECOND_SITE = 0.04
+P_NEAR = 0.04
+P_FORMER = 0.01
+P_NO_PLACE = 0.03
+DATE_FORMATS = {"%d.%m.%Y": 0.70, "%Y-%m-%d": 0.15, "%d/%m/%Y": 0.12, "": 0.03}
+
+
+def _places():
+    g = pd.read_csv(DEFAULT_PATH, sep="\t", dtype=str, keep_default_na=False)
+    sites = g[g["level"].isin(SITE_LEVELS)]
+    areas = g[g["level"] == "ilce"]
+    provinces = g[g["level"] == "il"].assign(ilce="Merkez")
+    return sites, pd.concat([areas, provinces], ignore_index=True)
+
+
+def _pick(rng, options, n):
+    keys = list(options)
+    p = np.asarray(list(options.values()), dtype=float)
+    return np.asarray(keys, dtype=object)[rng.choice(len(keys), n, p=p / p.sum())]
+
+
+def generate(n, seed=0, start="2021-01-01", days=1460):
+    """``n`` satırlık sentetik olay tablosu (tüm kolonlar metin)."""
+    rng = np.random.default_rng(seed)
+    sites, areas = _places()
+
+    # Yer: %45 OSB/sanayi sitesi adresi, kalanı mahalle adresi (ilçe/il merkezine düşer)
+    on_site = rng.random(n) < 0.45
+    si = rng.integers(0, len(sites), n)
+    ai = rng.integers(0, len(areas), n)
+    il = np.where(on_site, sites["il"].to_numpy()[si], areas["il"].to_numpy()[ai])
+    ilce = np.where(on_site, sites["ilce"].to_numpy()[si], areas["ilce"].to_numpy()[ai])
+    cad, no = rng.integers(1, 60, n), rng.integers(1, 120, n)
+    street = rng.choice(STREETS, n)
+    site_name = sites["name"].to_numpy()[si]
+    addr = [
+        f"{sn}, {c}. Cad. No:{k}" if o else f"{st} Mah., {c}. Sk. No:{k}"
+        for o, sn, c, k, st in zip(on_site, site_name, cad, no, street)
+    ]
+    place = [f"{a}/{b}" for a, b in zip(il, ilce)]
+    for i in np.flatnonzero(rng.random(n) < P_NO_PLACE):
+        place[i] = ""
+
+    # Tesis adı: iki kelime + sektör + şirket türü; desenler önceki satırlara bağlanır
+    sector = rng.choice(list(SECTORS), n)
+    w1, w2 = rng.choice(NAME_WORDS, n), rng.choice(NAME_WORDS, n)
+    suffix = rng.choice(SUFFIXES, n)
+    short = [f"{a} {b} {SECTORS[s]}" for a, b, s in zip(w1, w2, sector)]
+    names = [f"{s} {x}" for s, x in zip(short, suffix)]
+    roll = rng.random(n)
+    ref = (rng.random(n) * np.arange(n)).astype(np.int64)  # her satır için önceki bir satır
+    for i in np.flatnonzero(roll < P_SECOND_SITE + P_NEAR + P_FORMER):
+        if i == 0:
+            continue
+        j = ref[i]
+        if roll[i] < P_SECOND_SITE:
+            names[i] = f"{names[j].split(' (')[0]} ({rng.integers(2, 5)}. tesis)"
+        elif roll[i] < P_SECOND_SITE + P_NEAR:
+            names[i] = f"{names[i]} ({short[j]} yakını)"
+        else:
+            names[i] = f"{names[i]} (eski adı {short[j]})"
+
+    # Tarih: her biçim için gün başına bir kez biçimlenir, satırlara indeksle dağıtılır
+    day = rng.integers(0, days, n)
+    calendar = pd.date_range(start, periods=days, freq="D")
+    fmt = _pick(rng, DATE_FORMATS, n)
+    dates = np.full(n, "", dtype=object)
+    for f in DATE_FORMATS:
+        sel = fmt == f
+        if f and sel.any():
+            text = calendar.strftime(f)
+            if f == "%d.%m.%Y":
+                text = text.str.lstrip("0")  # gömülü listedeki gibi sıfırsız gün: '2.07.2025'
+            dates[sel] = text.to_numpy()[day[sel]]
+
+    conf = rng.integers(70, 101, n)
+    conf_fmt = rng.random(n)
+    conf_txt = [
+        f"{c}%" if r < 0.85 else f"{c / 100:.2f}".replace(".", ",") if r < 0.95 else str(c) if r < 0.98 else ""
+        for c, r in zip(conf, conf_fmt)
+    ]
+    src_a, src_b = rng.choice(SOURCES, n), rng.choice(SOURCES, n)
+
+    return pd.DataFrame({
+        "Tarih": dates,
+        "İl/İlçe": place,
+        "OSB/Mevki (Parsel/Adres)": addr,
+        "Tesis Adı (Alternatifler)": names,
+        "Sektör/Tip": sector,
+        "Olay Türü": _pick(rng, EVENTS, n),
+        "Doğrulama Yöntemi (A/B)": _pick(rng, {"A": 0.5, "B": 0.45, "A/B": 0.05}, n),
+        "Doğruluk Oranı": conf_txt,
+        "Kaynaklar": [f"{a} · {b}" for a, b in zip(src_a, src_b)],
+    }, columns=COLUMNS)
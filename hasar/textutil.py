@@ -0,0 +1,21 @@
+"""
+Türkçe metin normalizasyonu.
+
+Python'un ``str.lower()`` fonksiyonu 'I' -> 'i' ve 'İ' -> 'i̇' (birleşik nokta) üretir;
+Türkçe adreslerde bu yanlış eşleşmelere yol açar. Buradaki katlama önce Türkçe
+büyük harfleri elle çevirir, sonra aksanları korur.
+"""
+import re
+
+_TR_UPPER = str.maketrans({"I": "ı", "İ": "i"})
+_NON_WORD = re.compile(r"[^\w]+", flags=re.UNICODE)
+
+
+def tr_fold(s):
+    """Türkçe kurallarıyla küçük harfe çevir."""
+    return str(s).translate(_TR_UPPER).lower()
+
+
+def normalize_text(s):
+    """Katla, noktalama işaretlerini boşluğa çevir ve boşlukları sadeleştir."""
+    return " ".join(_NON_WORD.sub(" ", tr_fold(s)).split())
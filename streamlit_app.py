@@ -1,28 +1,20 @@
-**requirements.txt**
-
-```
-streamlit==1.39.0
-pandas==2.2.2
-folium==0.17.0
-streamlit-folium==0.21.0
-geopy==2.4.1
-```
-
-**app.py**
-
-```python
 import streamlit as st
 import pandas as pd
-from io import StringIO
-from datetime import datetime
-import re
+import io
+import math
+import os
 
-import folium
-from folium.plugins import MarkerCluster
 from streamlit_folium import st_folium
 
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
+from hasar.aggregates import GROUPINGS
+from hasar.eventstore import DEFAULT_DB_PATH as EVENT_DB_PATH, EventStore
+from hasar.export import export_csv_bytes
+from hasar.gazetteer import Gazetteer
+from hasar.geocache import DEFAULT_DB_PATH, GeocodeStore, NominatimProvider
+from hasar.ingest import IngestError, read_table
+from hasar.maplayer import build_heatmap, build_map, clicked_row_id, popup_html
+from hasar.pipeline import Pipeline, content_hash
+from hasar.profiling import DEFAULT_LOG_PATH as PROFILE_LOG_PATH, Profiler, activate, cache_counters, stage
 
 st.set_page_config(page_title="Hasar Olay Haritası", layout="wide", page_icon="🧭")
 
@@ -94,143 +86,49 @@ EMBEDDED_TSV = """Tarih\tİl/İlçe\tOSB/Mevki (Parsel/Adres)\tTesis Adı (Alter
 # =========================
 # 2) Yardımcılar
 # =========================
-def parse_date(s):
-    for fmt in ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y"):
-        try:
-            return datetime.strptime(str(s), fmt).date()
-        except Exception:
-            pass
-    return None
-
-def ensure_columns(df):
-    needed = [
-        "Çıkış Şekli", "PD Etkisi", "BI Etkisi", "Alıntı",
-        "Kaynak URL’leri", "Çevre Tesisler", "Lat", "Lon"
-    ]
-    for c in needed:
-        if c not in df.columns:
-            df[c] = ""
-    return df
-
-def normalize_cols(df):
-    def col(name):
-        for c in df.columns:
-            if c.lower().strip() == name.lower().strip():
-                return c
-        return name
-    return {
-        "Tarih": col("Tarih"),
-        "IlIlce": col("İl/İlçe"),
-        "Addr": col("OSB/Mevki (Parsel/Adres)"),
-        "Name": col("Tesis Adı (Alternatifler)"),
-        "Sector": col("Sektör/Tip"),
-        "Event": col("Olay Türü"),
-        "Method": col("Doğrulama Yöntemi (A/B)"),
-        "Conf": col("Doğruluk Oranı"),
-        "Sources": col("Kaynaklar"),
-        "Cause": col("Çıkış Şekli"),
-        "PD": col("PD Etkisi"),
-        "BI": col("BI Etkisi"),
-        "Quote": col("Alıntı"),
-        "URLs": col("Kaynak URL’leri"),
-        "Neighbors": col("Çevre Tesisler"),
-        "Lat": "Lat",
-        "Lon": "Lon",
-    }
-
-# Sık görülen OSB koordinatları (yaklaşık merkezler) — varsa bunları kullan, yoksa geocode
-OSB_COORDS = {
-    "Kayseri OSB": (38.779, 35.344),
-    "Batman OSB": (37.897, 41.140),
-    "Manisa OSB": (38.663, 27.405),
-    "Hasanağa OSB": (40.208, 28.749),
-    "Dilovası OSB": (40.793, 29.534),
-    "ALOSBİ": (38.780, 26.970),
-    "Aliağa OSB": (38.780, 26.970),
-    "Velimeşe OSB": (41.126, 27.954),
-    "Niğde OSB": (37.959, 34.716),
-    "İkitelli OSB": (41.073, 28.804),
-    "İSTOÇ": (41.063, 28.826),
-    "Avrupa Serbest Bölgesi": (41.189, 27.729),
-    "Çorum OSB": (40.604, 34.985),
-    "Karaman OSB": (37.164, 33.244),
-    "Gaziantep 2. OSB": (37.123, 37.388),
-    "Aksaray OSB": (38.280, 34.275),
-    "Keşan OSB": (40.849, 26.631),
-}
-
-@st.cache_data(show_spinner=False)
-def geocode_address(addr):
-    # OSB kısmi eşleşme ile hızlı koordinat
-    for key, (lat, lon) in OSB_COORDS.items():
-        if key.lower() in addr.lower():
-            return lat, lon
-    geolocator = Nominatim(user_agent="hasar-istihbarat/1.0")
-    geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1, swallow_exceptions=True)
-    loc = geocode(addr + ", Türkiye")
-    if loc:
-        return loc.latitude, loc.longitude
-    return None, None
-
-@st.cache_data(show_spinner=False)
-def geocode_df(df, C):
-    lat = df[C["Lat"]].astype(str).str.strip()
-    lon = df[C["Lon"]].astype(str).str.strip()
-    has_latlon = lat.ne("").sum() and lon.ne("").sum()
-    out = df.copy()
-    if has_latlon:
-        out["_lat"] = pd.to_numeric(lat, errors="coerce")
-        out["_lon"] = pd.to_numeric(lon, errors="coerce")
-    else:
-        coords = df[C["Addr"]].apply(lambda a: geocode_address(str(a)))
-        out["_lat"] = coords.apply(lambda t: t[0])
-        out["_lon"] = coords.apply(lambda t: t[1])
-    return out
-
-def infer_neighbors(df, C):
-    """
-    Sadece metinde AÇIKÇA belirtilen desenlerle (halüsinasyonsuz) ilişki kur:
-    - '(2. tesis)' -> aynı adın baz hali
-    - '(... yakını)' -> parantez içinde 'yakını' geçen isim
-    Üretilen 'Çevre Tesisler' kolonuna ';' ile yazılır.
-    """
-    neighbors_map = {i: set() for i in df.index}
-    names = df[C["Name"]].astype(str)
-
-    # (2. tesis) -> baz isim
-    for i, nm in names.items():
-        if "(2. tesis)" in nm:
-            base = nm.split("(2. tesis)")[0].strip()
-            matches = [j for j, other in names.items() if j != i and base and base.lower() in other.lower() and "(2. tesis)" not in other]
-            for j in matches:
-                neighbors_map[i].add(names[j])
-                neighbors_map[j].add(nm)
-
-    # '(X yakını)'
-    yakini_re = re.compile(r"\(([^)]+?)\s+yakını\)", flags=re.IGNORECASE)
-    for i, nm in names.items():
-        m = yakini_re.search(nm)
-        if m:
-            target = m.group(1).strip()
-            matches = [j for j, other in names.items() if j != i and target.lower() in other.lower()]
-            for j in matches:
-                neighbors_map[i].add(names[j])
-                neighbors_map[j].add(nm)
-
-    # yaz
-    neigh_col = []
-    for i in df.index:
-        neigh_col.append("; ".join(sorted(neighbors_map[i])) if neighbors_map[i] else "")
-    return neigh_col
-
-def event_color(evt):
-    e = (evt or "").lower()
-    if "patlama" in e and "yangın" in e: return "orange"
-    if "kimyasal" in e: return "purple"
-    if "çökme" in e or "göçük" in e: return "darkblue"
-    if "kran" in e: return "cadetblue"
-    if "yangın" in e: return "red"
-    return "gray"
+UPLOAD_TYPES = ["csv", "tsv", "txt", "parquet", "arrow", "feather", "ipc"]
+
+# Kalıcı geocode deposu (yeniden başlatmalarda korunur, komut satırı ile ortak)
+@st.cache_resource
+def get_geocode_store():
+    return GeocodeStore(DEFAULT_DB_PATH)
+
+@st.cache_resource
+def get_geocode_provider():
+    return NominatimProvider(user_agent="hasar-istihbarat/1.0")
+
+@st.cache_resource
+def get_gazetteer():
+    # OSB / sanayi sitesi / ilçe / il merkezleri (yaklaşık) — ağ gerektirmez
+    return Gazetteer.load()
+
+@st.cache_resource
+def get_pipeline():
+    # Aşama önbellekleri süreç boyunca paylaşılır (içerik özetiyle anahtarlı)
+    return Pipeline(get_gazetteer(), get_geocode_store(), get_geocode_provider())
+
+# Kalıcı olay deposu: yüklemeler birleştirilir, mükerrerler işaretlenir
+@st.cache_resource
+def get_event_store():
+    return EventStore(EVENT_DB_PATH)
+
+def merge_into_store(store, raw, name):
+    """Aynı içerik oturum içinde bir kez birleştirilir (depo zaten satır bazında tekildir)."""
+    merged = st.session_state.setdefault("merged_uploads", {})
+    key = content_hash(raw)
+    if key not in merged:
+        merged[key] = store.merge(read_table(io.BytesIO(raw), name=name), source=name)
+    return merged[key]
+
+CARD_PAGE_SIZES = [10, 25, 50, 100]
+
+# Performans paneli: anahtar kenar çubuğunun sonunda çizilir, değeri burada okunur.
+# Kapalıyken ölçüm noktaları boş bağlamdır (ek yük yok denecek kadar az).
+st.session_state.setdefault("debug_panel", os.environ.get("HASAR_PROFILE") == "1")
+profiler = activate(
+    Profiler(lambda: cache_counters(get_pipeline(), get_geocode_store()), PROFILE_LOG_PATH)
+    if st.session_state["debug_panel"] else None
+)
 
 # =========================
 # 3) Veri yükle & zenginleştir
@@ -238,62 +136,71 @@ def event_color(evt):
 st.title("Endüstriyel Hasar İstihbaratı — Harita & Detay Panosu")
 st.caption("Gömülü listeyi kullanır. İsterseniz kendi CSV/TSV dosyanızla da değiştirebilirsiniz.")
 
-uploaded = st.file_uploader("İsteğe bağlı: Kendi CSV/TSV dosyanızı yükleyin (başlıklar uyumlu olmalı).", type=["csv", "tsv"])
-if uploaded:
-    # Seperator'ı anlamaya çalış
-    raw = uploaded.read().decode("utf-8", errors="ignore")
-    sep = "\t" if "\t" in raw else ","
-    df = pd.read_csv(StringIO(raw), sep=sep).fillna("")
-else:
-    df = pd.read_csv(StringIO(EMBEDDED_TSV), sep="\t").fillna("")
-
-df = ensure_columns(df)
-C = normalize_cols(df)
-# Tarih
-df["_date"] = df[C["Tarih"]].apply(parse_date)
-
-# Neighbors (sadece açıkça belirtilen desenlerden)
-auto_neighbors = infer_neighbors(df, C)
-# Kullanıcı 'Çevre Tesisler' kolonu varsa birleştir (tekrarları engelle)
-base_neigh = df[C["Neighbors"]].astype(str).str.strip()
-combined = []
-for i, auto in enumerate(auto_neighbors):
-    items = set()
-    if base_neigh.iloc[i]:
-        items.update([x.strip() for x in base_neigh.iloc[i].split(";") if x.strip()])
-    if auto:
-        items.update([x.strip() for x in auto.split(";") if x.strip()])
-    combined.append("; ".join(sorted(items)))
-df[C["Neighbors"]] = combined
-
-# Geocode
-df = geocode_df(df, C)
-df_geo = df.dropna(subset=["_lat", "_lon"])
+uploaded = st.file_uploader(
+    "İsteğe bağlı: Kendi CSV/TSV, Parquet veya Arrow dosyanızı yükleyin (başlıklar uyumlu olmalı).",
+    type=UPLOAD_TYPES,
+)
+use_store = st.toggle(
+    "Kalıcı olay deposunu kullan", value=True,
+    help="Yüklemeler depoya eklenir; pano depodaki tüm olayları gösterir.",
+)
+# Aynı içerik (ham baytların özeti) için tüm aşamalar önbellekten gelir
+raw, source_name = (uploaded.getvalue(), uploaded.name) if uploaded else (EMBEDDED_TSV.encode("utf-8"), "embedded.tsv")
+try:
+    with st.spinner("Veri hazırlanıyor..."), stage("pipeline"):
+        if use_store:
+            store = get_event_store()
+            # Boş depo gömülü listeyle başlatılır
+            if uploaded or not len(store):
+                with stage("store.merge"):
+                    stats = merge_into_store(store, raw, source_name)
+                if uploaded:
+                    st.success(
+                        f"Depoya eklendi: {stats['inserted']} yeni olay "
+                        f"({stats['duplicates']} olası mükerrer), {stats['existing']} zaten kayıtlı."
+                    )
+            hide_dups = st.toggle("Olası mükerrer kayıtları gizle", value=True)
+            ds = get_pipeline().run_frame(
+                (store.version(), hide_dups),
+                lambda: store.load_frame(include_duplicates=not hide_dups),
+                lineage=(store.path, hide_dups),
+            )
+        else:
+            ds = get_pipeline().run(raw, source_name)
+except IngestError as e:
+    st.error(f"Dosya okunamadı: {e}")
+    st.stop()
+C = ds.C
+if ds.report:
+    with st.expander("Çözülemeyen değerler", expanded=False):
+        for col_name, values in ds.report.items():
+            st.markdown(f"**{col_name}** ({len(values)}): " + ", ".join(f"`{v}`" for v in values[:50]))
 
 # =========================
 # 4) Filtreler
 # =========================
 with st.sidebar:
     st.subheader("Filtreler")
+    df = ds.df
     mind, maxd = df["_date"].min(), df["_date"].max()
-    default_range = (mind, maxd) if pd.notna(mind) and pd.notna(maxd) else None
+    default_range = (mind.date(), maxd.date()) if pd.notna(mind) and pd.notna(maxd) else None
     date_range = st.date_input("Tarih aralığı", value=default_range)
-    cities = sorted([x for x in df[C["IlIlce"]].unique() if str(x).strip()])
+    cities = ds.query.values("IlIlce")
     city_sel = st.multiselect("İl/İlçe", cities, default=cities)
-    events = sorted([x for x in df[C["Event"]].unique() if str(x).strip()])
+    events = ds.query.values("Event")
     event_sel = st.multiselect("Olay Türü", events, default=events)
     method_sel = st.multiselect("Doğrulama", ["A","B"], default=["A","B"])
     show_neighbors = st.toggle("Çevre tesis bağlantılarını göster", value=True)
+    radius_km = st.slider("Yakındaki tesisler (km, 0 = kapalı)", 0.0, 25.0, 0.0, step=0.5)
+
+# Mekânsal yakınlık: yarıçap içindeki tesisler komşu kolonuna eklenir (yarıçap başına önbellekli)
+df = ds.with_proximity(radius_km)
 
-q = df.copy()
-if date_range and isinstance(date_range, (list, tuple)) and len(date_range) == 2 and all(date_range):
-    q = q[(q["_date"] >= date_range[0]) & (q["_date"] <= date_range[1])]
-if city_sel:
-    q = q[q[C["IlIlce"]].isin(city_sel)]
-if event_sel:
-    q = q[q[C["Event"]].isin(event_sel)]
-if method_sel:
-    q = q[q[C["Method"]].str.upper().str.contains("|".join(method_sel))]
+# Filtreler veri seti başına kurulan indekslerden tek bir maske olarak çözülür
+if not (date_range and isinstance(date_range, (list, tuple)) and len(date_range) == 2 and all(date_range)):
+    date_range = None
+with stage("filter", len(df)):
+    q = df[ds.query.mask(date_range, city_sel, event_sel, method_sel)]
 
 q_geo = q.dropna(subset=["_lat", "_lon"])
 
@@ -301,91 +208,121 @@ q_geo = q.dropna(subset=["_lat", "_lon"])
 # 5) Harita
 # =========================
 st.subheader("Harita")
-m = folium.Map(location=[39.0, 35.0], zoom_start=6, control_scale=True)
-mc = MarkerCluster().add_to(m)
-
-# İsim -> koordinat haritası (komşular için gerekebilir)
-name_to_xy = {}
-for _, r in df_geo.iterrows():
-    name_to_xy.setdefault(r[C["Name"]], (r["_lat"], r["_lon"]))
-
-for _, r in q_geo.iterrows():
-    title = f"{r[C['Name']]} — {r[C['Event']]}"
-    popup_html = f"""
-    <div style='width: 360px'>
-      <b>{r[C['Name']]}</b><br>
-      <i>{r[C['Sector']]}</i><br><br>
-      <b>Olay:</b> {r[C['Event']]}<br>
-      <b>Tarih:</b> {r[C['Tarih']]}<br>
-      <b>İl/İlçe:</b> {r[C['IlIlce']]}<br>
-      <b>Adres/OSB:</b> {r[C['Addr']]}<br>
-      <b>Doğrulama:</b> {r[C['Method']]} ({r[C['Conf']]})<br>
-      <b>Çıkış şekli:</b> {r[C['Cause']]}<br>
-      <b>PD:</b> {r[C['PD']]}<br>
-      <b>BI:</b> {r[C['BI']]}<br>
-      <b>Kaynaklar:</b> {r[C['Sources']]}
-    </div>
-    """
-    folium.CircleMarker(
-        location=[r["_lat"], r["_lon"]],
-        radius=7,
-        color=event_color(r[C["Event"]]),
-        fill=True, fill_opacity=0.9,
-        popup=folium.Popup(popup_html, max_width=420),
-        tooltip=title
-    ).add_to(mc)
-
-# Komşu bağlantıları (sadece açıkça belirtilen desenlerden üretilen/var olan isimlerle)
-if show_neighbors:
-    for _, r in q_geo.iterrows():
-        neighs = [x.strip() for x in str(r[C["Neighbors"]]).split(";") if x.strip()]
-        for nb in neighs:
-            if nb in name_to_xy:
-                lat1, lon1 = r["_lat"], r["_lon"]
-                lat2, lon2 = name_to_xy[nb]
-                if pd.notna(lat1) and pd.notna(lat2):
-                    folium.PolyLine([[lat1, lon1], [lat2, lon2]], weight=2, opacity=0.7).add_to(m)
+# Özet görünümler (yoğunluk, grafikler) ham satırlardan değil, veri seti başına bir kez kurulan küplerden çizilir
+agg_filters = dict(date_range=date_range, cities=city_sel, events=event_sel, methods=method_sel)
+map_view = st.radio("Görünüm", ["Olaylar", "Yoğunluk"], horizontal=True, label_visibility="collapsed")
+if map_view == "Yoğunluk":
+    with stage("map.build"):
+        m = build_heatmap(ds.aggregates.heat_points(**agg_filters))
+    with stage("st_folium"):
+        st_folium(m, width=None, height=580, returned_objects=[])
+    st.caption("Yoğunluk ~5 km'lik hücrelerden hesaplanır; tarih filtresi ay çözünürlüğünde uygulanır.")
+else:
+    # İsim -> koordinat haritası (komşular için gerekebilir)
+    with stage("map.build", len(q_geo)):
+        m, high_volume = build_map(q_geo, C, ds.name_coords, show_neighbors)
+    # Yüksek hacimde popup'lar gömülmez: tıklanan noktanın detayı satır id'si ile gösterilir
+    with stage("st_folium", len(q_geo)):
+        map_state = st_folium(m, width=None, height=580, returned_objects=["last_active_drawing"] if high_volume else [])
+    if high_volume:
+        st.caption(f"{len(q_geo)} olay — yüksek hacim modu. Detay için bir noktaya tıklayın.")
+        rid = clicked_row_id(map_state)
+        if rid is not None and rid in q_geo.index:
+            st.markdown(popup_html(q_geo.loc[rid], C), unsafe_allow_html=True)
 
-st_folium(m, width=None, height=580)
+# =========================
+# 6) Özet Grafikler
+# =========================
+st.subheader("Özet Grafikler")
+grouping = st.selectbox("Gruplama", list(GROUPINGS), index=0)
+with stage("charts"):
+    summary = ds.aggregates.rollup(GROUPINGS[grouping], **agg_filters)
+    gc1, gc2 = st.columns(2)
+    gc1.caption("Olay sayısı")
+    gc1.bar_chart(summary["count"])
+    gc2.caption("Doğruluk ağırlıklı toplam")
+    gc2.bar_chart(summary["weight"])
 
 # =========================
-# 6) Olay Kartları
+# 7) Olay Kartları
 # =========================
 st.subheader("Olay Kartları")
-for _, r in q.sort_values(by="_date", ascending=False).iterrows():
-    with st.container():
-        st.markdown(f"### {r[C['Name']]} — **{r[C['Event']]}**")
-        st.markdown(
-            f"**Tarih:** {r[C['Tarih']]}  •  **İl/İlçe:** {r[C['IlIlce']]}  •  "
-            f"**Doğrulama:** `{r[C['Method']]}`  •  **Doğruluk:** {r[C['Conf']]}"
-        )
-        st.markdown(f"**Adres/OSB:** {r[C['Addr']]}  \n**Sektör:** {r[C['Sector']]}")
-        c1, c2, c3 = st.columns(3)
-        c1.markdown(f"**Çıkış şekli**  \n{r[C['Cause']]}")
-        c2.markdown(f"**PD etkisi**  \n{r[C['PD']]}")
-        c3.markdown(f"**BI etkisi**  \n{r[C['BI']]}")
-        if str(r[C["Quote"]]).strip():
-            st.markdown(f"> {r[C['Quote']]}")
-        urls = [u.strip() for u in str(r[C["URLs"]]).split(";") if u.strip()]
-        if urls:
-            st.write("**Kaynak linkleri:**", "  ".join([f"[Link {i+1}]({u})" for i, u in enumerate(urls)]))
-        neighs = [x.strip() for x in str(r[C["Neighbors"]]).split(";") if x.strip()]
-        if neighs:
-            st.markdown(f"**Çevre tesis(ler):** " + ", ".join(neighs))
-        st.markdown("---")
+# Sıra tüm veri için bir kez hesaplanır; filtre sonucu bu sıradan süzülür
+order = ds.date_order
+visible = order[pd.Index(order).isin(q.index)]
+pc1, pc2, pc3 = st.columns([1, 1, 2])
+page_size = pc1.selectbox("Sayfa başına", CARD_PAGE_SIZES, index=1)
+n_pages = max(1, math.ceil(len(visible) / page_size))
+if st.session_state.get("card_page", 1) > n_pages:
+    st.session_state["card_page"] = n_pages
+page = pc2.number_input("Sayfa", min_value=1, max_value=n_pages, step=1, key="card_page")
+start = (page - 1) * page_size
+pc3.caption(f"{len(visible)} olaydan {start + 1 if len(visible) else 0}–{min(start + page_size, len(visible))} gösteriliyor")
+
+# Yalnızca görünen sayfanın kartları üretilir
+page_rows = visible[start:start + page_size]
+with stage("cards", len(page_rows)):
+    for _, r in q.loc[page_rows].iterrows():
+        with st.container():
+            st.markdown(f"### {r[C['Name']]} — **{r[C['Event']]}**")
+            st.markdown(
+                f"**Tarih:** {r[C['Tarih']]}  •  **İl/İlçe:** {r[C['IlIlce']]}  •  "
+                f"**Doğrulama:** `{r[C['Method']]}`  •  **Doğruluk:** {r[C['Conf']]}"
+            )
+            st.markdown(f"**Adres/OSB:** {r[C['Addr']]}  \n**Sektör:** {r[C['Sector']]}")
+            if pd.notna(r.get("_duplicate_of")):
+                st.caption(f"Olası mükerrer kayıt — depo olayı #{r['_duplicate_of']} ile aynı olay olabilir.")
+            c1, c2, c3 = st.columns(3)
+            c1.markdown(f"**Çıkış şekli**  \n{r[C['Cause']]}")
+            c2.markdown(f"**PD etkisi**  \n{r[C['PD']]}")
+            c3.markdown(f"**BI etkisi**  \n{r[C['BI']]}")
+            if str(r[C["Quote"]]).strip():
+                st.markdown(f"> {r[C['Quote']]}")
+            urls = [u.strip() for u in str(r[C["URLs"]]).split(";") if u.strip()]
+            if urls:
+                st.write("**Kaynak linkleri:**", "  ".join([f"[Link {i+1}]({u})" for i, u in enumerate(urls)]))
+            neighs = [x.strip() for x in str(r[C["Neighbors"]]).split(";") if x.strip()]
+            if neighs:
+                st.markdown(f"**Çevre tesis(ler):** " + ", ".join(neighs))
+            nearby = [x.strip() for x in str(r[C["Nearby"]]).split(";") if x.strip()]
+            if nearby:
+                st.markdown(f"**Yakın tesis(ler) ({radius_km:g} km):** " + ", ".join(nearby))
+            st.markdown("---")
 
 # =========================
-# 7) İndirilebilir çıktı
+# 8) İndirilebilir çıktı
 # =========================
 st.subheader("Çıktı")
-export_cols = [
-    C["Tarih"], C["IlIlce"], C["Addr"], C["Name"], C["Sector"], C["Event"],
-    C["Method"], C["Conf"], C["Sources"], C["Cause"], C["PD"], C["BI"],
-    C["Quote"], C["URLs"], C["Neighbors"], "_lat", "_lon"
-]
-export_df = q[export_cols].rename(columns={"_lat": "Lat", "_lon": "Lon"})
-csv_bytes = export_df.to_csv(index=False).encode("utf-8")
+with stage("export", len(q)):
+    csv_bytes = export_csv_bytes(q, C)
 st.download_button("Filtrelenmiş CSV'yi indir", data=csv_bytes, file_name="hasar_olaylari_filtreli.csv", mime="text/csv")
 
-st.caption("Not: Komşu/çevre tesis bağlantıları yalnızca haber metninde AÇIKÇA belirtilen desenlerden (örn. '(2. tesis)', '(... yakını)') türetilir.")
-```
+st.caption(
+    "Not: Çevre tesis bağlantıları yalnızca haber metninde AÇIKÇA belirtilen desenlerden (örn. '(2. tesis)', '(... yakını)') türetilir."
+    + (f" 'Yakın Tesisler' ise yalnızca konuma göre ({radius_km:g} km içinde) bulunur; haritada kesikli çizgiyle gösterilir."
+       if radius_km else "")
+)
+
+# =========================
+# 9) Performans paneli (debug)
+# =========================
+with st.sidebar:
+    st.divider()
+    st.toggle(
+        "Performans paneli (debug)", key="debug_panel",
+        help=f"Aşama süreleri, önbellek oranları ve bellek; her çalıştırma {PROFILE_LOG_PATH} dosyasına eklenir.",
+    )
+    if profiler is not None:
+        report = profiler.finish(rows=len(ds.df), visible=len(q))
+        st.caption(
+            f"Toplam {report['total_seconds']:.3f} sn · RSS {report['rss_mb']} MB · tepe {report['peak_mb']} MB"
+        )
+        st.dataframe(
+            pd.DataFrame([
+                {"Aşama": "· " * s["depth"] + s["stage"], "sn": s["seconds"], "Satır": s["rows"], "RSS MB": s["rss_mb"]}
+                for s in report["stages"]
+            ]),
+            hide_index=True, use_container_width=True,
+        )
+        if report["caches"]:
+            st.dataframe(pd.DataFrame(report["caches"]).T, use_container_width=True)
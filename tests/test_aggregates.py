@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hasar.aggregates import BIN_DIMS, CUBE_DIMS, Aggregates
+from hasar.ingest import ensure_columns, normalize_cols, type_frame
+from hasar.query import QueryEngine
+from hasar.synth import generate
+
+
+@pytest.fixture(scope="module")
+def typed():
+    df = ensure_columns(generate(4000, seed=5))
+    C = normalize_cols(df)
+    df, _ = type_frame(df, C)
+    rng = np.random.default_rng(5)
+    df["_lat"] = np.where(rng.random(len(df)) < 0.9, rng.uniform(36.0, 42.0, len(df)), np.nan)
+    df["_lon"] = rng.uniform(26.0, 45.0, len(df))
+    return df, C
+
+
+def _canonical(table, dims):
+    out = table.copy()
+    for d in dims:
+        out[d] = out[d].astype(str)
+    return out.sort_values(dims).reset_index(drop=True)[dims + ["count", "weight"]]
+
+
+def test_updated_equals_from_frame(typed):
+    df, C = typed
+    full = Aggregates.from_frame(df, C)
+    inc = Aggregates.from_frame(df.iloc[:2500], C).updated(df.iloc[2500:3100], C).updated(df.iloc[3100:], C)
+    assert inc.rows == full.rows == len(df)
+    pd.testing.assert_frame_equal(_canonical(inc.cube, CUBE_DIMS), _canonical(full.cube, CUBE_DIMS))
+    pd.testing.assert_frame_equal(_canonical(inc.bins, BIN_DIMS), _canonical(full.bins, BIN_DIMS))
+
+
+def test_rollup_counts_match_query_mask(typed):
+    df, C = typed
+    agg, engine = Aggregates.from_frame(df, C), QueryEngine(df, C)
+    cities, events = engine.values("IlIlce"), engine.values("Event")
+    month = df["_date"].dropna().dt.to_period("M")
+    # Tarih filtresi ay çözünürlüğünde: ay sınırlarına hizalı aralıklar
+    date_range = (month.min().to_timestamp(), (month.max() - 2).to_timestamp(how="end").normalize())
+    cases = [
+        {},
+        {"cities": cities, "events": events, "methods": ["A", "B"]},
+        {"date_range": date_range, "cities": cities[::2], "methods": ["B"]},
+        {"date_range": date_range, "events": events[:1], "methods": ["A"]},
+    ]
+    columns = {"il": "_il", "sector": C["Sector"], "event": C["Event"]}
+    for filters in cases:
+        mask = engine.mask(**filters)
+        for by, col in columns.items():
+            expected = df.loc[mask, col].astype(str).value_counts()
+            got = agg.rollup(by, **filters)["count"]
+            pd.testing.assert_series_equal(
+                got.sort_index(), expected.sort_index(), check_names=False, check_dtype=False,
+            )
+        assert agg.rollup("month", **filters)["count"].sum() == (mask & df["_date"].notna().to_numpy()).sum()
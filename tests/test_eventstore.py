@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from hasar.eventstore import MAX_BLOCK, EventStore
+
+COLUMNS = ["Tarih", "İl/İlçe", "OSB/Mevki (Parsel/Adres)", "Tesis Adı (Alternatifler)", "Olay Türü"]
+
+GAZIANTEP = [
+    ("16.08.2025", "Gaziantep/Şehitkamil", "2. OSB", "Dilek Halı İthalat İhracat Sanayi ve Ticaret A.Ş.", "Yangın"),
+    ("17.08.2025", "Gaziantep/Şehitkamil", "2. OSB, 83230–83211 Cad.",
+     "Akpınar Geri Dönüşüm Sanayi ve Ticaret Ltd. Şti. (Dilek Halı yakını)", "Yangın"),
+    ("18.08.2025", "Gaziantep/Şehitkamil", "2. OSB", "Geri Dönüşüm Fabrikası (2. OSB)", "Yangın"),
+]
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = EventStore(tmp_path / "events.sqlite")
+    yield s
+    s.close()
+
+
+def test_gaziantep_events_share_one_canonical_id(store):
+    assert store.merge(_frame(GAZIANTEP)) == {"inserted": 3, "existing": 0, "duplicates": 2}
+    df = store.load_frame(include_duplicates=True)
+    canonical = df["_event_id"].iloc[0]
+    assert df["_duplicate_of"].iloc[1:].tolist() == [canonical, canonical]
+    assert store.duplicate_groups() == {canonical: df["_event_id"].iloc[1:].tolist()}
+    assert store.load_frame()["_event_id"].tolist() == [canonical]
+
+
+def test_no_match_across_provinces_or_outside_window(store):
+    name = "Dilek Halı Sanayi A.Ş."
+    store.merge(_frame([("16.08.2025", "Gaziantep/Şehitkamil", "2. OSB", name, "Yangın")]))
+    stats = store.merge(_frame([
+        ("16.08.2025", "Kahramanmaraş/Onikişubat", "OSB", name, "Yangın"),
+        ("19.08.2025", "Gaziantep/Şehitkamil", "2. OSB", name, "Yangın"),
+        ("13.08.2025", "Gaziantep/Şehitkamil", "2. OSB", name, "Yangın"),
+    ]))
+    assert stats == {"inserted": 3, "existing": 0, "duplicates": 0}
+    # Pencere sınırı (±2 gün) dahil
+    stats = store.merge(_frame([("14.08.2025", "Gaziantep/Şahinbey", "Başpınar", name, "Patlama")]))
+    assert stats["duplicates"] == 1
+
+
+def test_merging_same_file_again_is_noop(store):
+    df = _frame(GAZIANTEP)
+    store.merge(df)
+    version = store.version()
+    assert store.merge(df) == {"inserted": 0, "existing": 3, "duplicates": 0}
+    assert store.version() == version
+    assert len(store) == 3
+
+
+def test_crowded_block_is_skipped(store):
+    rows = [("16.08.2025", "Bursa/Nilüfer", "Nilüfer OSB", "Tekstil A.Ş.", "Yangın")]
+    rows += [
+        ("16.08.2025", "Bursa/Nilüfer", "Nilüfer OSB", f"Tekstil Örme{i} Ltd. Şti.", "Yangın")
+        for i in range(MAX_BLOCK)
+    ]
+    store.merge(_frame(rows[:2]))
+    # Blok küçükken tek kelimelik ad eşleşir
+    assert store.merge(_frame([("17.08.2025", "Bursa/Nilüfer", "OSB", "Tekstil Ltd.", "Yangın")]))["duplicates"] == 1
+    store.merge(_frame(rows[2:]))
+    # 'tekstil' bloğu MAX_BLOCK'u aşınca ayırt edici sayılmaz
+    assert store.merge(_frame([("17.08.2025", "Bursa/Nilüfer", "OSB", "Tekstil San.", "Yangın")]))["duplicates"] == 0
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from hasar.gazetteer import Gazetteer, mentions_site
+from hasar.geocache import StaticProvider
+from hasar.ingest import ensure_columns, normalize_cols
+from hasar.pipeline import LRUCache, geocode_df
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return Gazetteer.load()
+
+
+@pytest.mark.parametrize("addr, place, name", [
+    ("Eskişehir OSB, 14. Cad. No:18-20", "Eskişehir/Odunpazarı", "Eskişehir OSB"),
+    ("Çumra OSB (İstiklal OSB, Konevi No:10/1)", "Konya/Çumra", "Çumra OSB"),
+    ("ASO 1. OSB (Akhun Cd. çevresi)", "Ankara/Sincan", "ASO 1. OSB"),
+    ("Kirazlık Mah., Örnek Sanayi Sitesi", "Samsun/Tekkeköy", "Örnek Sanayi Sitesi"),
+    ("EMKO Sanayi Bölgesi (Geri Dönüşümcüler Sitesi)", "Eskişehir/Odunpazarı", "EMKO Sanayi Bölgesi"),
+    ("ALOSBİ (Aliağa OSB)", "İzmir/Aliağa", "ALOSBİ"),
+])
+def test_site_match(gazetteer, addr, place, name):
+    lat, lon, level = gazetteer.lookup(addr, place)
+    assert level in ("osb", "sanayi")
+    assert gazetteer.match_site(addr)["name"] == name
+
+
+def test_fallback_to_ilce_and_il(gazetteer):
+    assert gazetteer.lookup("Hasanbey Mah.", "Balıkesir/Gönen")[2] == "ilce"
+    assert gazetteer.lookup("Fabrika Cad.", "Bolu/Yok")[2] == "il"
+    assert gazetteer.lookup("Fabrika Cad.", "") is None
+
+
+def test_mentions_site():
+    assert mentions_site("OSB, Erenler Mah.")
+    assert mentions_site("Yeni Organize Sanayi Bölgesi 3. Cad.")
+    assert not mentions_site("Sanayi Mahallesi")
+    assert not mentions_site("Hatip Mah., Ali Osman Çelebi Bulvarı")
+
+
+def _frame(rows):
+    df = ensure_columns(pd.DataFrame(rows, columns=["İl/İlçe", "OSB/Mevki (Parsel/Adres)", "Tesis Adı (Alternatifler)"]))
+    return df, normalize_cols(df)
+
+
+def test_unknown_site_goes_to_provider_before_centroid(gazetteer):
+    df, C = _frame([
+        ("Aksaray/Merkez", "OSB, Erenler Mah.", "A"),
+        ("Aksaray/Merkez", "Yeni Organize Sanayi, 2. Cad.", "B"),
+        ("Balıkesir/Gönen", "Hasanbey Mah.", "C"),
+    ])
+    provider = StaticProvider({"OSB, Erenler Mah.": (38.33, 33.98)})
+    memo = LRUCache(10)
+    out = geocode_df(df, C, gazetteer, provider=provider, memo=memo)
+    assert out["_geo_level"].tolist() == ["geocode", "il", "ilce"]
+    assert (out["_lat"][0], out["_lon"][0]) == (38.33, 33.98)
+    assert provider.calls == 2
+    # Çözülemeyen site adresi merkezde kalır ama satır önbelleğine yazılmaz
+    geocode_df(df, C, gazetteer, provider=provider, memo=memo)
+    assert provider.calls == 3
+
+
+def test_province_centroid_is_only_a_fallback(gazetteer):
+    # İlçe tablosunda olmayan ilçe: il merkezine düşmeden önce sağlayıcıya sorulur
+    df, C = _frame([
+        ("Kocaeli/Gebze", "Yenidoğan Mah.", "A"),
+        ("Bolu/Karacasu", "Fabrika Cad.", "B"),
+    ])
+    assert gazetteer.lookup("Yenidoğan Mah.", "Kocaeli/Gebze")[2] == "il"
+    provider = StaticProvider({"Yenidoğan Mah.": (40.80, 29.43)})
+    out = geocode_df(df, C, gazetteer, provider=provider)
+    assert out["_geo_level"].tolist() == ["geocode", "il"]
+    assert provider.calls == 2
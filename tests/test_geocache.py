@@ -0,0 +1,87 @@
+import pytest
+
+from hasar import geocache
+from hasar.geocache import GeocodeStore, StaticProvider, geocode_addresses, normalize_address
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = GeocodeStore(tmp_path / "geo.sqlite")
+    yield s
+    s.close()
+
+
+class FlakyProvider:
+    """İlk ``failures`` çağrıda hata fırlatan, sonra sözlükten çözen sağlayıcı."""
+
+    def __init__(self, mapping, failures=1):
+        self.inner = StaticProvider(mapping)
+        self.failures = failures
+
+    def __call__(self, addr):
+        if self.failures:
+            self.failures -= 1
+            raise TimeoutError("geçici")
+        return self.inner(addr)
+
+
+def test_duplicate_addresses_resolved_once(store):
+    provider = StaticProvider({"Kayseri OSB 5. Cad": (38.7, 35.3)})
+    addrs = ["Kayseri OSB 5. Cad", "kayseri osb, 5. cad", "Kayseri OSB 5. Cad"]
+    out = geocode_addresses(addrs, store, provider)
+    assert provider.calls == 1
+    assert out == {a: (38.7, 35.3) for a in addrs}
+
+
+def test_store_hit_skips_provider(store):
+    provider = StaticProvider({"Batman OSB": (37.9, 41.1)})
+    geocode_addresses(["Batman OSB"], store, provider)
+    geocode_addresses(["Batman OSB"], store, provider)
+    assert provider.calls == 1
+    assert store.hits == 1
+
+
+def test_negative_entry_cached(store):
+    provider = StaticProvider({})
+    assert geocode_addresses(["Bilinmeyen Sk."], store, provider) == {"Bilinmeyen Sk.": (None, None)}
+    assert store.get_many([normalize_address("Bilinmeyen Sk.")]) == {normalize_address("Bilinmeyen Sk."): None}
+    geocode_addresses(["Bilinmeyen Sk."], store, provider)
+    assert provider.calls == 1
+
+
+def test_expired_entries_are_refetched(store, monkeypatch):
+    provider = StaticProvider({"Manisa OSB": (38.6, 27.4), "Yok Mah.": None})
+    geocode_addresses(["Manisa OSB", "Yok Mah."], store, provider)
+    now = geocache.time.time()
+    # Negatif kayıt kısa TTL ile düşer, pozitif kayıt durur
+    monkeypatch.setattr(geocache.time, "time", lambda: now + store.negative_ttl + 1)
+    assert store.get_many([normalize_address("Manisa OSB"), normalize_address("Yok Mah.")]) == {
+        normalize_address("Manisa OSB"): (38.6, 27.4),
+    }
+    geocode_addresses(["Manisa OSB", "Yok Mah."], store, provider)
+    assert provider.calls == 3
+    monkeypatch.setattr(geocache.time, "time", lambda: now + store.ttl + 1)
+    geocode_addresses(["Manisa OSB"], store, provider)
+    assert provider.calls == 4
+
+
+def test_transient_error_not_cached(store):
+    provider = FlakyProvider({"Hasanağa OSB": (40.2, 28.7)})
+    assert geocode_addresses(["Hasanağa OSB"], store, provider) == {"Hasanağa OSB": (None, None)}
+    assert store.get_many([normalize_address("Hasanağa OSB")]) == {}
+    assert geocode_addresses(["Hasanağa OSB"], store, provider) == {"Hasanağa OSB": (40.2, 28.7)}
+
+
+def test_results_flushed_when_interrupted(store):
+    mapping = {f"Adres {i}": (float(i), 30.0) for i in range(7)}
+    inner = StaticProvider(mapping)
+
+    def provider(addr):
+        if inner.calls == 5:
+            raise KeyboardInterrupt
+        return inner(addr)
+
+    with pytest.raises(KeyboardInterrupt):
+        geocode_addresses(list(mapping), store, provider, flush_every=2)
+    saved = store.get_many(normalize_address(a) for a in mapping)
+    assert len(saved) == 5
@@ -0,0 +1,73 @@
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pytest
+
+from hasar.ingest import (
+    IngestError, ensure_columns, normalize_cols, parse_confidence, parse_dates, read_table, type_frame,
+)
+from hasar.synth import COLUMNS
+
+
+def test_parse_dates_format_cascade():
+    s = pd.Series(["2.07.2025", "16.08.2025", "2025-08-18", "03/01/2024", "", "32.13.2025", "dün"])
+    out = parse_dates(s)
+    assert out.iloc[:4].tolist() == [
+        pd.Timestamp("2025-07-02"), pd.Timestamp("2025-08-16"),
+        pd.Timestamp("2025-08-18"), pd.Timestamp("2024-01-03"),
+    ]
+    assert out.iloc[4:].isna().all()
+
+
+def test_parse_confidence():
+    s = pd.Series(["95%", " 80 % ", "0,95", "0.9", "1", "85", "", "yüksek"])
+    out = parse_confidence(s)
+    assert out.iloc[:6].tolist() == [95.0, 80.0, 95.0, 90.0, 100.0, 85.0]
+    assert out.iloc[6:].isna().all()
+
+
+def test_type_frame_reports_unparsed_values():
+    df = ensure_columns(pd.DataFrame({
+        "Tarih": ["2.07.2025", "sonra", "sonra", ""],
+        "İl/İlçe": ["Bursa/Nilüfer", "Ankara", "", "Kocaeli / Gebze"],
+        "Olay Türü": ["Yangın"] * 4,
+        "Sektör/Tip": ["Tekstil"] * 4,
+        "Doğrulama Yöntemi (A/B)": ["A"] * 4,
+        "Doğruluk Oranı": ["90%", "?", "0,8", ""],
+    }))
+    C = normalize_cols(df)
+    df, report = type_frame(df, C)
+    assert report == {"Tarih": ["sonra"], "Doğruluk Oranı": ["?"]}
+    assert df["_il"].tolist() == ["Bursa", "Ankara", "", "Kocaeli"]
+    assert df["_ilce"].tolist() == ["Nilüfer", "", "", "Gebze"]
+    assert isinstance(df[C["Event"]].dtype, pd.CategoricalDtype)
+    assert df["_conf"].iloc[2] == 80.0
+
+
+def test_corrupt_parquet_is_ingest_error(tmp_path):
+    path = tmp_path / "bozuk.parquet"
+    path.write_bytes(b"PAR1" + b"\x00" * 64)
+    with pytest.raises(IngestError):
+        read_table(path)
+
+
+def test_arrow_dictionary_column_with_nulls(tmp_path):
+    cols = {c: pa.array(["x", "y"]) for c in COLUMNS}
+    cols["Olay Türü"] = pa.array(["Yangın", None]).dictionary_encode()
+    path = tmp_path / "olaylar.feather"
+    feather.write_feather(pa.table(cols), path)
+    df = read_table(path)
+    assert df["Olay Türü"].tolist() == ["Yangın", ""]
+
+
+def test_optional_columns_are_created():
+    raw = "Tarih\tİl/İlçe\tOSB/Mevki (Parsel/Adres)\tTesis Adı (Alternatifler)\tOlay Türü\n" \
+          "2.07.2025\tBursa/Nilüfer\tNilüfer OSB\tA Tekstil\tYangın\n"
+    df = ensure_columns(read_table(io.BytesIO(raw.encode())))
+    C = normalize_cols(df)
+    df, report = type_frame(df, C)
+    assert report == {}
+    assert df["_conf"].isna().all()
+    assert df[C["Method"]].tolist() == [""]
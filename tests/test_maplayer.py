@@ -0,0 +1,40 @@
+import folium
+import pandas as pd
+
+from hasar.ingest import ensure_columns, normalize_cols
+from hasar.maplayer import add_neighbor_lines, build_map, name_coords, popup_html
+from hasar.synth import COLUMNS
+
+
+def _frame():
+    df = ensure_columns(pd.DataFrame("", index=range(4), columns=COLUMNS))
+    df["Tesis Adı (Alternatifler)"] = ["A", "A", "B", "C"]
+    df["Olay Türü"] = "Yangın"
+    df["_lat"] = [40.0, 40.0, 40.01, 40.02]
+    df["_lon"] = [29.0, 29.0, 29.0, 29.0]
+    df["_geo_level"] = "osb"
+    df["Çevre Tesisler"] = ["B", "B", "A; C", "B"]
+    return df, normalize_cols(df)
+
+
+def test_neighbor_lines_deduplicated():
+    df, C = _frame()
+    # A-B iki olaydan ve iki yönden, B-C iki yönden geliyor: iki çizgi
+    assert add_neighbor_lines(folium.Map(), df, C, name_coords(df, C)) == 2
+    assert add_neighbor_lines(folium.Map(), df, C, name_coords(df, C), limit=1) == 1
+
+
+def test_high_volume_mode():
+    df, C = _frame()
+    _, high_volume = build_map(df, C, name_coords(df, C), threshold=3)
+    assert high_volume
+    _, high_volume = build_map(df, C, name_coords(df, C))
+    assert not high_volume
+
+
+def test_popup_escapes_cell_values():
+    df, C = _frame()
+    df["Tesis Adı (Alternatifler)"] = "<img src=x onerror=alert(1)>"
+    out = popup_html(df.iloc[0], C)
+    assert "<img" not in out
+    assert "&lt;img src=x onerror=alert(1)&gt;" in out
@@ -0,0 +1,61 @@
+import pandas as pd
+
+from hasar.ingest import ensure_columns, normalize_cols
+from hasar.neighbors import NameIndex, NeighborLinker, infer_neighbors
+
+
+def _links(names):
+    df = ensure_columns(pd.DataFrame({"Tesis Adı (Alternatifler)": names}))
+    return infer_neighbors(df, normalize_cols(df))
+
+
+def test_containing_requires_consecutive_tokens():
+    index = NameIndex(["Akın Tekstil A.Ş.", "Tekstil Akın Ltd.", "Yılmaz Akın Tekstil", "Akın"])
+    assert index.containing("akın tekstil") == [0, 2]
+    assert index.containing("AKIN") == [0, 1, 2, 3]
+    assert index.containing("Akın Gıda") == []
+    assert index.containing("") == []
+
+
+def test_rules():
+    out = _links([
+        "Başak Plastik A.Ş.",
+        "Başak Plastik A.Ş. (2. tesis)",
+        "Başak Plastik A.Ş. (3. tesis)",
+        "Kaya Gıda (Başak Plastik yakını)",
+        "Demir Metal (eski adı Kaya Gıda)",
+    ])
+    assert out[0] == "Başak Plastik A.Ş. (2. tesis); Başak Plastik A.Ş. (3. tesis); Kaya Gıda (Başak Plastik yakını)"
+    # '(N. tesis)' yalnızca baz ada bağlanır, kardeş tesise değil
+    assert out[1] == "Başak Plastik A.Ş.; Kaya Gıda (Başak Plastik yakını)"
+    assert out[4] == "Kaya Gıda (Başak Plastik yakını)"
+
+
+def test_repeated_rows_share_links_but_not_self():
+    out = _links(["Ege Kimya (Toros Gıda yakını)", "Toros Gıda", "Ege Kimya (Toros Gıda yakını)"])
+    assert out == ["Toros Gıda", "Ege Kimya (Toros Gıda yakını)", "Toros Gıda"]
+
+
+def test_linker_incremental_matches_full_rebuild():
+    base = [
+        "Başak Plastik A.Ş.",
+        "Başak Plastik A.Ş. (2. tesis)",
+        "Kaya Gıda (Başak Plastik yakını)",
+        "Demir Metal (eski adı Kaya Gıda)",
+        "Ege Kimya",
+    ]
+    linker = NeighborLinker()
+    linker.update(base)
+    changed = [
+        "Başak Plastik A.Ş. (2. tesis)",
+        "Kaya Gıda (Başak Plastik yakını)",
+        "Ege Kimya Ltd. (eski adı Demir Metal)",
+        "Demir Metal (eski adı Kaya Gıda)",
+        "Başak Plastik A.Ş.",
+        "Toros Ambalaj (Ege Kimya yakını)",
+    ]
+    assert linker.update(changed) == NeighborLinker().update(changed)
+    # Adların çoğu çıkınca indeks yeniden kurulur, ilişkiler korunur
+    small = ["Ege Kimya", "Toros Ambalaj (Ege Kimya yakını)"]
+    assert linker.update(small) == ["Toros Ambalaj (Ege Kimya yakını)", "Ege Kimya"]
+    assert linker.index.dead == 0
@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+from hasar.gazetteer import Gazetteer
+from hasar.geocache import StaticProvider
+from hasar.pipeline import Pipeline
+from hasar.synth import generate
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return Gazetteer.load()
+
+
+def _raw(df):
+    return df.to_csv(sep="\t", index=False).encode("utf-8")
+
+
+def test_same_content_is_cached(gazetteer):
+    raw = _raw(generate(300, seed=1))
+    pipeline = Pipeline(gazetteer, provider=StaticProvider())
+    assert pipeline.run(raw, "a.tsv") is pipeline.run(raw, "a.tsv")
+
+
+def test_changed_rows_only_recomputed(gazetteer):
+    src = generate(2000, seed=2)
+    changed = src.copy()
+    changed.loc[[5, 700], "Tesis Adı (Alternatifler)"] = ["Yeni Tesis A.Ş.", "Ek Ltd. (Yeni Tesis yakını)"]
+    changed.loc[9, "Tarih"] = "3.03.2024"
+    changed = pd.concat([changed, changed.tail(3)], ignore_index=True)
+
+    pipeline = Pipeline(gazetteer, provider=StaticProvider())
+    pipeline.run(_raw(src), "a.tsv")
+    before = pipeline.typed_rows.misses
+    ds = pipeline.run(_raw(changed), "b.tsv")
+    assert pipeline.typed_rows.misses - before == 1
+
+    fresh = Pipeline(gazetteer, provider=StaticProvider()).run(_raw(changed), "b.tsv")
+    pd.testing.assert_frame_equal(ds.df, fresh.df)
+    assert ds.df.loc[5, "Çevre Tesisler"] == "Ek Ltd. (Yeni Tesis yakını)"
+
+
+def test_run_path_matches_bytes_and_memory_maps(gazetteer, tmp_path, monkeypatch):
+    import pyarrow as pa
+
+    from hasar import ingest
+
+    src = generate(500, seed=4)
+    path = tmp_path / "olaylar.arrow"
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, pa.Schema.from_pandas(src, preserve_index=False)) as w:
+        w.write_table(pa.Table.from_pandas(src, preserve_index=False))
+
+    mapped = []
+    memory_map = pa.memory_map
+    monkeypatch.setattr(pa, "memory_map", lambda *a: mapped.append(a) or memory_map(*a))
+    pipeline = Pipeline(gazetteer, provider=StaticProvider())
+    ds = pipeline.run_path(path)
+    assert mapped
+    assert ds is pipeline.run(path.read_bytes(), "olaylar.arrow")
+    pd.testing.assert_frame_equal(ds.df, Pipeline(gazetteer, provider=StaticProvider()).run(path.read_bytes()).df)
+    assert ingest.read_table(path).shape == src.shape
+
+
+def test_proximity_goes_to_its_own_column(gazetteer):
+    src = generate(1500, seed=6)
+    ds = Pipeline(gazetteer, provider=StaticProvider()).run(_raw(src), "a.tsv")
+    df = ds.with_proximity(5)
+    assert df["Yakın Tesisler"].ne("").any()
+    assert df["Çevre Tesisler"].equals(ds.df["Çevre Tesisler"])
+    assert ds.with_proximity(0)["Yakın Tesisler"].eq("").all()
+
+
+def test_name_coords_built_once_per_dataset(gazetteer):
+    ds = Pipeline(gazetteer, provider=StaticProvider()).run(_raw(generate(500, seed=7)), "a.tsv")
+    coords = ds.name_coords
+    assert coords is ds.name_coords
+    first = ds.df_geo.drop_duplicates(subset=[ds.C["Name"]]).iloc[0]
+    assert coords[first[ds.C["Name"]]] == (first["_lat"], first["_lon"])
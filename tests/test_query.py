@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hasar.ingest import ensure_columns, normalize_cols, type_frame
+from hasar.query import QueryEngine
+from hasar.synth import generate
+
+
+@pytest.fixture(scope="module")
+def typed():
+    df = ensure_columns(generate(3000, seed=4))
+    df.loc[df.index[::37], "Olay Türü"] = ""
+    df.loc[df.index[::53], "Doğrulama Yöntemi (A/B)"] = "a"
+    C = normalize_cols(df)
+    df, _ = type_frame(df, C)
+    return df, C
+
+
+def _chained(df, C, date_range, cities, events, methods):
+    """Sorgu motorundan önceki zincirleme maske filtreleri."""
+    q = df
+    if date_range:
+        q = q[(q["_date"] >= pd.Timestamp(date_range[0])) & (q["_date"] <= pd.Timestamp(date_range[1]))]
+    if cities:
+        q = q[q[C["IlIlce"]].isin(cities)]
+    if events:
+        q = q[q[C["Event"]].isin(events)]
+    if methods:
+        q = q[q[C["Method"]].str.upper().str.contains("|".join(methods))]
+    return df.index.isin(q.index)
+
+
+def test_mask_matches_chained_filters(typed):
+    df, C = typed
+    engine = QueryEngine(df, C)
+    cities, events = engine.values("IlIlce"), engine.values("Event")
+    dates = df["_date"].dropna().sort_values()
+    rng = np.random.default_rng(0)
+    cases = [
+        # Kenar çubuğu varsayılanı: boş olmayan tüm değerler seçili (boş kategoriler dışarıda)
+        (None, cities, events, ["A", "B"]),
+        (None, None, None, None),
+        # Uç tarihler aralığa dahil
+        ((dates.iloc[10].date(), dates.iloc[10].date()), None, None, None),
+        ((dates.iloc[0].date(), dates.iloc[-1].date()), None, None, None),
+        (None, None, None, ["A"]),
+        (None, None, None, ["B"]),
+    ]
+    for _ in range(40):
+        lo, hi = sorted(rng.choice(len(dates), 2))
+        cases.append((
+            (dates.iloc[lo].date(), dates.iloc[hi].date()) if rng.random() < 0.7 else None,
+            list(rng.choice(cities, rng.integers(1, len(cities) + 1), replace=False)),
+            list(rng.choice(events, rng.integers(1, len(events) + 1), replace=False)),
+            list(rng.choice(["A", "B"], rng.integers(0, 3), replace=False)),
+        ))
+    for case in cases:
+        np.testing.assert_array_equal(engine.mask(*case), _chained(df, C, *case), err_msg=str(case))
+
+
+def test_blank_categories_excluded_when_all_values_selected(typed):
+    df, C = typed
+    engine = QueryEngine(df, C)
+    mask = engine.mask(events=engine.values("Event"))
+    assert (df[C["Event"]].astype(str) == "").any()
+    assert not mask[(df[C["Event"]].astype(str) == "").to_numpy()].any()
+    assert mask.sum() == (df[C["Event"]].astype(str) != "").sum()
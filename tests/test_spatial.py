@@ -0,0 +1,34 @@
+import numpy as np
+
+from hasar.neighbors import proximity_neighbors
+from hasar.spatial import GridIndex, haversine_km
+
+
+def test_radius_and_knn_match_brute_force():
+    rng = np.random.default_rng(0)
+    lat, lon = rng.uniform(39.5, 40.5, 500), rng.uniform(28.5, 29.5, 500)
+    index = GridIndex(lat, lon)
+    d = haversine_km(lat[7], lon[7], lat, lon)
+    hits, _ = index.radius(lat[7], lon[7], 12)
+    assert sorted(hits.tolist()) == np.flatnonzero(d <= 12).tolist()
+    near, _ = index.knn(lat[7], lon[7], 5)
+    assert near.tolist() == np.argsort(d, kind="stable")[:5].tolist()
+
+
+def test_proximity_limit_applies_after_same_name_filter():
+    # Aynı merkezde 30 olaylı X, 1 km ötede Y
+    names = ["X A.Ş."] * 30 + ["Y Ltd."]
+    lat = np.r_[np.full(30, 40.0), 40.009]
+    lon = np.full(31, 29.0)
+    out = proximity_neighbors(names, GridIndex(lat, lon), 5, limit=25)
+    assert out[0] == out[29] == "Y Ltd."
+    assert out[30] == "X A.Ş."
+
+
+def test_proximity_orders_by_distance_and_skips_missing():
+    names = ["A", "B", "C", "D"]
+    lat = np.array([40.0, 40.02, 40.008, np.nan])
+    lon = np.array([29.0, 29.0, 29.0, 29.0])
+    out = proximity_neighbors(names, GridIndex(lat, lon), 5, limit=1)
+    assert out == ["C", "C", "A", ""]
+    assert proximity_neighbors(names, GridIndex(lat, lon), 5)[0] == "C; B"